@@ -3,11 +3,18 @@ Setup script for WSA Terminal
 This script can be used to create an executable using PyInstaller
 """
 
+import os
 from setuptools import setup, find_packages
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
 
+# Optionally compile the web terminal with mypyc (set WSA_MYPYC=1, needs mypy)
+ext_modules = []
+if os.environ.get("WSA_MYPYC") == "1":
+    from mypyc.build import mypycify
+    ext_modules = mypycify(["--ignore-missing-imports", "wsa.py"])
+
 setup(
     name="wsa-terminal",
     version="1.0.0",
@@ -16,6 +23,8 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     packages=find_packages(),
+    py_modules=["wsa", "wsa_console"],
+    ext_modules=ext_modules,
     install_requires=[
         "aiohttp>=3.8.0",
     ],
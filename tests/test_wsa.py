@@ -0,0 +1,39 @@
+"""
+Tests for the WSA Terminal virtual file system
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wsa
+
+
+@unittest.skipIf(wsa.IS_WINDOWS, "DH0: maps to the real C: drive on Windows")
+class NestedDirectoryTest(unittest.TestCase):
+    """Virtual files below DH0: subdirectories, reached with CD"""
+    
+    def setUp(self):
+        self.terminal = wsa.AmigaTerminal()
+        self.terminal.execute_command("cd DH0:")
+        self.terminal.execute_command("cd Windows")
+        
+    def test_dir_lists_nested_files(self):
+        self.assertEqual(self.terminal.current_dir, "DH0:/Windows")
+        listing = self.terminal.list_files()
+        self.assertIn("explorer.exe", listing)
+        self.assertIn("0 DIR(s), 1 FILE(s)", listing)
+        
+    def test_pattern_matches_nested_files(self):
+        output = self.terminal.pattern_command(["~exp"])
+        self.assertIn("explorer.exe (rwed)", output)
+        self.assertNotIn("No files match the pattern", output)
+        
+    def test_relative_completion_offers_nested_files(self):
+        self.assertEqual(self.terminal.get_directory_contents("e"), ["explorer.exe"])
+
+
+if __name__ == "__main__":
+    unittest.main()
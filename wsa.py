@@ -5,24 +5,155 @@ Python implementation of the Amiga terminal emulator
 """
 
 import asyncio
+import bisect
+import collections
+import functools
+import gzip
 import os
 import sys
 import json
 import argparse
+import io
+import itertools
 import platform
+import re
+import time
+import zlib
+from array import array
 from datetime import datetime
 from pathlib import Path
 
 try:
-    from aiohttp import web, WSMsgType
+    import psutil
+except ImportError:
+    psutil = None  # Optional, only used for the memory size in INFO
+
+try:
+    import orjson
 except ImportError:
-    print("Please install aiohttp: pip install aiohttp")
-    sys.exit(1)
+    orjson = None  # type: ignore[assignment]  # Optional, faster websocket message encoding
 
 # Version information
 WSA_VERSION = "1.0.0"
 
+# Host platform, resolved once: DH0: maps to the real C: drive only on Windows
+IS_WINDOWS = platform.system() == "Windows"
+
+# Commands offered for autocomplete, sorted once at import
+AVAILABLE_COMMANDS = tuple(sorted(["info", "avail", "status", "mount", "ed", "dir", "cd", "pattern",
+                                   "date", "echo", "help", "amiga", "ping", "cls", "clear"]))
+
+# AVAIL output, which also lists EXECUTE, rendered once at import
+AVAIL_OUTPUT = "Available commands:\n" + "".join(f"  {cmd}\n" for cmd in sorted(AVAILABLE_COMMANDS + ("execute",)))
+
+# INFO output up to the host description, rendered once at import
+INFO_HEADER = f"""Amiga 3.1
+Copyright (C) 1985-1995 Commodore-Amiga, Inc.
+WSA Terminal - Windows Subsystem for Amiga v{WSA_VERSION}
+
+System Information:
+  CPU: Motorola 68020 @ 25MHz
+  RAM: 8MB Chip + 4MB Fast
+  OS: AmigaOS 3.1
+  WB: Workbench 3.1
+  CLI: Amiga Shell 3.1
+
+Actual System Information:
+"""
+
+# Commands remembered per session; older entries are dropped
+HISTORY_SIZE = 1000
+
+# Seconds a DH0: directory scan stays valid before hitting the disk again
+FS_CACHE_TTL = 2.0
+# DH0: directory scans kept per session, least recently used dropped first
+FS_CACHE_SIZE = 64
+
+# Classifies a startup script line in one pass: a comment, "echo <text>"
+# (text kept verbatim) or a command with its arguments
+STARTUP_LINE_PATTERN = re.compile(r"\s*(?:;.*|(echo) (.*?)|(\S+)\s*(.*?))?\s*$", re.IGNORECASE)
+
+# Empty (names, sizes) entry for directories without indexed files
+NO_FILES = ((), ())
+
+# DIR listing table layout
+LISTING_HEADER = "Name              Size  Protection  Date\n----              ----  ----------  ----\n"
+LISTING_DIR_ROW = "{:<18}DIR   drwx      01-Jan-85\n"
+LISTING_FILE_ROW = "{:<18}{:>5}  rwed      01-Jan-85\n"
+# Rows per websocket frame when streaming a DIR listing
+LISTING_CHUNK_ROWS = 256
+
+# PATTERN result rows
+PATTERN_DIR_ROW = "  {}/ (drwx)\n"
+PATTERN_FILE_ROW = "  {} (rwed)\n"
+
+@functools.lru_cache(maxsize=8)
+def compile_startup_script(content):
+    """Parse a startup script into (command, args, line) steps, cached by content"""
+    # Every session runs the same Startup-Sequence, so it is only parsed once.
+    # Echo lines keep their literal text and are stored with command None.
+    program = []
+    for line in content.split('\n'):
+        echo, text, cmd, args = STARTUP_LINE_PATTERN.match(line).groups()
+        if echo:
+            program.append((None, text, line.strip()))
+        elif cmd:
+            program.append((cmd.lower(), tuple(args.split()), line.strip()))
+        # Anything else is a comment or an empty line
+    return tuple(program)
+
+@functools.lru_cache(maxsize=32)
+def compile_pattern(pattern):
+    """Compile an Amiga PATTERN argument into a cached (literal prefix, name matcher) pair"""
+    # "#?" on its own keeps its documented meaning of single character names
+    # and "~prefix" matches names starting with prefix. Elsewhere "#?" and "*"
+    # match any run of characters and "?" matches exactly one.
+    if pattern == "#?":
+        return "", re.compile(".", re.DOTALL).fullmatch
+    prefix_only = pattern.startswith("~")
+    if prefix_only:
+        pattern = pattern[1:]
+    tokens = re.findall(r"#\?|[*?]|[^#*?]+|#", pattern)
+    regex = "".join(
+        ".*" if token in ("#?", "*") else "." if token == "?" else re.escape(token)
+        for token in tokens
+    )
+    if prefix_only:
+        regex += ".*"
+    # Every match starts with the literal text before the first wildcard
+    literal = "".join(itertools.takewhile(lambda token: token not in ("#?", "*", "?"), tokens))
+    return literal, re.compile(regex, re.DOTALL).fullmatch
+
+def prefix_range(names, prefix):
+    """Return the (start, stop) slice of sorted names that start with prefix"""
+    start = bisect.bisect_left(names, prefix)
+    return start, bisect.bisect_left(names, prefix + "\U0010ffff", start)
+
+@functools.lru_cache(maxsize=None)
+def host_system_info():
+    """Describe the host machine for INFO, computed once per process"""
+    system_info = f"""System: {platform.system()} {platform.release()}
+Processor: {platform.processor() or 'Unknown'}
+Machine: {platform.machine()}
+Node Name: {platform.node()}
+Python Version: {platform.python_version()}
+"""
+    
+    # Try to get memory information on Windows
+    if IS_WINDOWS:
+        if psutil:
+            memory = psutil.virtual_memory()
+            memory_info = f"Memory: {memory.total // (1024**3)}GB RAM\n"
+        else:
+            memory_info = "Memory: Unknown (install psutil for detailed info)\n"
+    else:
+        memory_info = "Memory: Unknown\n"
+    return f"  {system_info}  {memory_info}"
+
 class AmigaTerminal:
+    __slots__ = ("current_dir", "directories", "files", "prompt", "command_history", "commands_entered", "startup_output",
+                 "_children", "_sorted_dirs", "_devices_casefold", "_dispatch", "_fs_cache", "_last_dh0")
+    
     def __init__(self):
         self.current_dir = "SYS:"
         # Add Windows C: drive by default
@@ -54,7 +185,7 @@ class AmigaTerminal:
         }
         
         # Add Windows C: drive files if we're on Windows
-        if platform.system() == "Windows":
+        if IS_WINDOWS:
             # Try to get actual C: drive contents
             try:
                 c_drive_path = "C:\\"
@@ -90,36 +221,36 @@ class AmigaTerminal:
                 "DH0:/Users/": "Users directory"
             })
         
+        # Intern directory paths, the keys of every per-directory lookup
+        self.directories = {sys.intern(path): names for path, names in self.directories.items()}
+        
+        # Index virtual files by parent directory for fast listings
+        self._build_file_index()
+        self._build_device_index()
+        self._build_dispatch_table()
+        
+        # Recent DH0: directory scans: (fs_path, mtime) -> (timestamp, entries)
+        self._fs_cache = collections.OrderedDict()
+        # Last DH0: path resolved to a real directory: (sub_path, timestamp, fs_path)
+        self._last_dh0 = None
+        
         self.prompt = "SYS:> "
-        self.command_history = []
+        self.command_history = collections.deque(maxlen=HISTORY_SIZE)
+        # Total commands added to the history, lets callers spot new entries
+        self.commands_entered = 0
         
-        # Execute startup sequence
-        self._execute_startup_sequence()
+        # Execute startup sequence, keeping its output for the client
+        self.startup_output = self._execute_startup_sequence()
         
     def _execute_startup_sequence(self):
         """Execute the Amiga-style startup sequence and return output"""
         output = "Executing startup sequence...\n"
         
-        # Check for SYS:S/Startup-Sequence in virtual file system
+        # Check SYS:S/Startup-Sequence and other common startup locations
+        # in the virtual file system before touching the disk
         startup_file = "SYS:S/Startup-Sequence"
-        if startup_file in self.files:
-            startup_output = self._run_startup_script(startup_file, self.files[startup_file])
-            return output + startup_output
-            
-        # Check for actual file in DH0: (Windows C: drive)
-        if platform.system() == "Windows":
-            try:
-                fs_path = os.path.join("C:\\", "S", "Startup-Sequence")
-                if os.path.exists(fs_path):
-                    with open(fs_path, 'r') as f:
-                        content = f.read()
-                    startup_output = self._run_startup_script(startup_file, content)
-                    return output + startup_output
-            except Exception:
-                pass  # Continue to next check
-                
-        # Check for other common startup locations
         startup_locations = [
+            startup_file,
             "SYS:S/startup-sequence",
             "S:Startup-Sequence",
             "S:startup-sequence"
@@ -130,210 +261,255 @@ class AmigaTerminal:
                 startup_output = self._run_startup_script(location, self.files[location])
                 return output + startup_output
                 
+        # Check for actual file in DH0: (Windows C: drive)
+        if IS_WINDOWS:
+            try:
+                fs_path = os.path.join("C:\\", "S", "Startup-Sequence")
+                if os.path.exists(fs_path):
+                    with open(fs_path, 'r') as f:
+                        content = f.read()
+                    startup_output = self._run_startup_script(startup_file, content)
+                    return output + startup_output
+            except Exception:
+                pass  # No startup sequence available
+                
         return output
         
+    def _build_file_index(self):
+        """Map each parent directory to parallel (names, sizes) arrays of its files"""
+        entries = {}
+        for file_path, content in self.files.items():
+            device, sep, rest = file_path.partition(":")
+            if not sep:
+                continue
+            parent, _, name = rest.rpartition("/")
+            if not name:  # Skip directory placeholder entries like "DH0:/Users/"
+                continue
+            # Keyed like the paths CD produces: "DH0:/Windows" keeps its slash
+            parent_path = f"{device}:{parent}"
+            if name in self.directories.get(parent_path, ()):
+                continue  # Directory entries (e.g. C: commands) shadow same-named files
+            entries.setdefault(parent_path, []).append((name, len(content)))
+        
+        # Names are kept sorted so prefix lookups can bisect; subdirectory names
+        # get a sorted copy, their declared order is the DIR listing order
+        self._sorted_dirs = {path: sorted(names) for path, names in self.directories.items()}
+        self._children = {}
+        for parent_path, items in entries.items():
+            items.sort()
+            self._children[sys.intern(parent_path)] = ([name for name, _ in items], array('i', [size for _, size in items]))
+    
+    def _build_device_index(self):
+        """Map casefolded device names to their canonical spelling"""
+        self._devices_casefold = {device.casefold(): device for device in self.directories}
+    
+    def _build_dispatch_table(self):
+        """Map command names to handlers taking the list of arguments"""
+        clear_screen = lambda args: {"action": "clear"}
+        self._dispatch = {
+            "dir": lambda args: self.list_files(),
+            "cd": lambda args: self.change_directory(" ".join(args)),
+            "info": lambda args: self.info_command(),
+            "avail": lambda args: self.avail_command(),
+            "status": lambda args: self.status_command(),
+            "mount": lambda args: self.mount_command(),
+            "echo": lambda args: " ".join(args) + "\n",
+            "date": lambda args: str(datetime.now()) + "\n",
+            "help": lambda args: self.help_command(),
+            "amiga": lambda args: self.amiga_command(),
+            "ping": self.ping_command,
+            "pattern": self.pattern_command,
+            "cls": clear_screen,
+            "clear": clear_screen,
+        }
+    
+    def _scan_fs(self, fs_path):
+        """Return (name, is_dir, size) entries for a real directory, cached by its mtime"""
+        # Adding, removing or renaming an entry changes the directory mtime, so a
+        # single stat invalidates the cached scan at once; the TTL bounds how long
+        # file sizes can go stale
+        key = (fs_path, os.stat(fs_path).st_mtime_ns)
+        now = time.monotonic()
+        cached = self._fs_cache.get(key)
+        if cached and now - cached[0] < FS_CACHE_TTL:
+            self._fs_cache.move_to_end(key)
+            return cached[1]
+        
+        entries = []
+        with os.scandir(fs_path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    # If we can't access the item, treat it as a file
+                    is_dir = False
+                size = 0
+                if not is_dir:
+                    try:
+                        size = entry.stat().st_size
+                    except OSError:
+                        pass
+                entries.append((entry.name, is_dir, size))
+        
+        self._fs_cache[key] = (now, entries)
+        self._fs_cache.move_to_end(key)
+        if len(self._fs_cache) > FS_CACHE_SIZE:
+            self._fs_cache.popitem(last=False)
+        return entries
+    
     def _run_startup_script(self, script_name, content):
         """Run a startup script and return output"""
-        output = f"Executing {script_name}...\n"
-        lines = content.split('\n')
-        for line in lines:
-            line = line.strip()
-            # Skip comments and empty lines
-            if not line or line.startswith(';'):
-                continue
-                
+        # Collect all output in one buffer so it reaches the client as a single frame
+        output = io.StringIO()
+        write = output.write
+        write(f"Executing {script_name}...\n")
+        for cmd, args, line in compile_startup_script(content):
             # Execute the command
             try:
                 # Handle echo commands
-                if line.lower().startswith('echo '):
-                    output += line[5:] + "\n"
+                if cmd is None:
+                    write(args + "\n")
                 # Handle other commands
                 else:
-                    # Parse command and arguments
-                    parts = line.split()
-                    if not parts:
-                        continue
-                        
-                    cmd = parts[0].lower()
-                    args = ' '.join(parts[1:]) if len(parts) > 1 else ''
-                    
-                    # Execute built-in commands
-                    if cmd == "info":
-                        output += self.info_command() + "\n"
-                    elif cmd == "avail":
-                        output += self.avail_command() + "\n"
-                    elif cmd == "status":
-                        output += self.status_command() + "\n"
-                    elif cmd == "mount":
-                        output += self.mount_command() + "\n"
-                    elif cmd == "dir":
-                        output += self.list_files() + "\n"
-                    elif cmd == "date":
-                        output += str(datetime.now()) + "\n"
-                    elif cmd == "echo":
-                        output += args + "\n"
-                    elif cmd == "help":
-                        output += self.help_command() + "\n"
-                    elif cmd == "amiga":
-                        output += self.amiga_command() + "\n"
-                    elif cmd == "ping" and args:
-                        output += self.ping_command([args]) + "\n"
-                    elif cmd == "pattern" and args:
-                        output += self.pattern_command([args]) + "\n"
-                    # Handle some special cases
-                    elif cmd == 'cd':
-                        result = self.change_directory(args)
-                        if result:
-                            output += result + "\n"
+                    # Execute built-in commands through the shared dispatch table
+                    handler = self._dispatch.get(cmd)
+                    if handler:
+                        result = handler(list(args))
+                        # Screen actions such as CLS have no meaning during startup
+                        if isinstance(result, str):
+                            write(result)
                     else:
-                        output += f"Startup command not recognized: {line}\n"
+                        write(f"Startup command not recognized: {line}\n")
             except Exception as e:
-                output += f"Error executing startup command '{line}': {e}\n"
+                write(f"Error executing startup command '{line}': {e}\n")
                 
-        return output
+        return output.getvalue()
+        
+    def _parse_path(self, path):
+        """Split an Amiga path into its interned uppercase device and sub path"""
+        device, sep, sub_path = path.partition(":")
+        if not sep:
+            return "", path
+        return sys.intern(device.upper() + ":"), sub_path.lstrip("/")
+        
+    def _dh0_to_fs(self, sub_path):
+        """Resolve a DH0: sub path to an existing directory on C:, or None"""
+        last = self._last_dh0
+        if last and last[0] == sub_path and time.monotonic() - last[1] < FS_CACHE_TTL:
+            return last[2]
+            
+        if not sub_path:
+            fs_path = "C:\\"
+        else:
+            fs_path = os.path.join("C:\\", sub_path.replace("/", "\\"))
+            # Try with trailing backslash if path doesn't exist
+            if not os.path.exists(fs_path) and not fs_path.endswith(("\\", "/")):
+                fs_path += "\\"
+                
+        if not os.path.isdir(fs_path):
+            return None
+            
+        self._last_dh0 = (sub_path, time.monotonic(), fs_path)
+        return fs_path
         
     def get_prompt(self):
         return f"{self.current_dir}> "
         
     def list_files(self, path=None):
+        listing = self._listing_source(path)
+        if isinstance(listing, str):
+            return listing
+        return self._format_listing(*listing)
+        
+    def list_files_stream(self, path=None):
+        """Yield a DIR listing in chunks so huge DH0: directories can be streamed"""
+        listing = self._listing_source(path)
+        if isinstance(listing, str):
+            yield listing
+        else:
+            yield from self._iter_listing(*listing)
+        
+    def _listing_source(self, path):
+        """Return (path, dirs, file_names, file_sizes) for a DIR listing, or an error message"""
         if path is None:
             path = self.current_dir
             
         # Handle DH0: (Windows C: drive) with actual file system access
-        if path.startswith("DH0:"):
-            if platform.system() == "Windows":
+        device, sub_path = self._parse_path(path)
+        if device == "DH0:":
+            if IS_WINDOWS:
                 try:
                     # Determine the actual file system path
-                    if path == "DH0:":
-                        fs_path = "C:\\"
-                    else:
-                        # Extract subdirectory path from DH0:subdir format
-                        sub_path = path[4:]  # Remove "DH0:" prefix
-                        if sub_path.startswith("/"):
-                            sub_path = sub_path[1:]
-                        fs_path = os.path.join("C:\\", sub_path.replace("/", "\\"))
-                    
-                    # Try with trailing backslash if path doesn't exist
-                    if not os.path.exists(fs_path):
-                        if not fs_path.endswith("\\") and not fs_path.endswith("/"):
-                            fs_path_alt = fs_path + "\\"
-                            if os.path.exists(fs_path_alt):
-                                fs_path = fs_path_alt
-                    
-                    if os.path.exists(fs_path) and os.path.isdir(fs_path):
-                        output = f"Directory {path}\n"
-                        output += "\n"
-                        output += "Name              Size  Protection  Date\n"
-                        output += "----              ----  ----------  ----\n"
-                        
+                    fs_path = self._dh0_to_fs(sub_path)
+                    if fs_path:
                         # List actual directories and files in the path
                         try:
-                            items = os.listdir(fs_path)
+                            entries = self._scan_fs(fs_path)
                         except PermissionError:
                             return "Access denied to this directory.\n"
                         except Exception as e:
                             return f"Error reading directory: {e}\n"
                         
-                        dirs = []
-                        files = []
-                        
                         # Separate directories and files
-                        for item in items:
-                            item_path = os.path.join(fs_path, item)
-                            try:
-                                if os.path.isdir(item_path):
-                                    dirs.append(item)
-                                else:
-                                    files.append(item)
-                            except:
-                                # If we can't access the item, treat it as a file
-                                files.append(item)
+                        dirs = [name for name, is_dir, _ in entries if is_dir]
+                        files = [(name, size) for name, is_dir, size in entries if not is_dir]
                                 
                         # Sort directories and files
                         dirs.sort(key=str.lower)
-                        files.sort(key=str.lower)
+                        files.sort(key=lambda item: item[0].lower())
                         
-                        # Print directories first
-                        for dir_name in dirs:
-                            output += f"{dir_name+'/':<18}DIR   drwx      01-Jan-85\n"
-                            
-                        # Print files
-                        for file_name in files:
-                            file_path = os.path.join(fs_path, file_name)
-                            try:
-                                file_size = os.path.getsize(file_path)
-                            except:
-                                file_size = 0
-                            output += f"{file_name:<18}{file_size:>5}  rwed      01-Jan-85\n"
-                            
-                        dir_count = len(dirs)
-                        file_count = len(files)
-                        output += f"\n{dir_count} DIR(s), {file_count} FILE(s)\n"
-                        return output
+                        # Print directories first, then files
+                        return path, dirs, [name for name, _ in files], [size for _, size in files]
                     else:
                         return f"Directory {path} not found.\n"
-                except Exception as e:
-                    output = f"Error accessing directory {path}: {e}\n"
-                    # Fall back to placeholder content if there's an error
-                    pass
+                except Exception:
+                    pass  # Fall back to placeholder content if there's an error
             
             # Fallback to placeholder content
-            output = f"Directory {path}\n"
-            output += "\n"
-            output += "Name              Size  Protection  Date\n"
-            output += "----              ----  ----------  ----\n"
-            
-            # List directories
-            dirs = self.directories.get(path, [])
-            for dir_name in dirs:
-                output += f"{dir_name+'/':<18}DIR   drwx      01-Jan-85\n"
-                
-            # List files in current directory
-            file_count = 0
-            for file_path in self.files:
-                if file_path.startswith(path + "/"):
-                    file_name = file_path[len(path) + 1:]
-                    if "/" not in file_name:  # Only direct children
-                        file_content = self.files[file_path]
-                        file_size = len(file_content)
-                        output += f"{file_name:<18}{file_size:>5}  rwed      01-Jan-85\n"
-                        file_count += 1
-                        
-            output += f"\n{len(dirs)} DIR(s), {file_count} FILE(s)\n"
-            return output
+            return (path, self.directories.get(path, []), *self._children.get(path, NO_FILES))
             
         if path not in self.directories:
             return f"Directory {path} not found.\n"
             
-        output = f"Directory {path}\n"
-        output += "\n"
-        output += "Name              Size  Protection  Date\n"
-        output += "----              ----  ----------  ----\n"
+        # List subdirectories and the files in this directory
+        return (path, self.directories.get(path, []), *self._children.get(path, NO_FILES))
         
-        # List subdirectories
-        dirs = self.directories.get(path, [])
-        for dir_name in dirs:
-            output += f"{dir_name+'/':<18}DIR   drwx      01-Jan-85\n"
-            
-        # List files in current directory
-        file_count = 0
-        for file_path in self.files:
-            if file_path.startswith(path + "/"):
-                file_name = file_path[len(path) + 1:]
-                if "/" not in file_name:  # Only direct children
-                    file_content = self.files[file_path]
-                    file_size = len(file_content)
-                    output += f"{file_name:<18}{file_size:>5}  rwed      01-Jan-85\n"
-                    file_count += 1
-                    
-        output += f"\n{len(dirs)} DIR(s), {file_count} FILE(s)\n"
-        return output
+    def _format_listing(self, path, dirs, file_names, file_sizes):
+        """Render an Amiga DIR table from directory names and parallel file names/sizes"""
+        return "".join(self._iter_listing(path, dirs, file_names, file_sizes))
+        
+    def _iter_listing(self, path, dirs, file_names, file_sizes):
+        """Yield an Amiga DIR table in chunks of at most LISTING_CHUNK_ROWS rows"""
+        parts = [f"Directory {path}\n", "\n", LISTING_HEADER]
+        append = parts.append
+        dir_row = LISTING_DIR_ROW.format
+        file_row = LISTING_FILE_ROW.format
+        rows = itertools.chain(
+            (dir_row(dir_name + "/") for dir_name in dirs),
+            (file_row(file_name, file_size) for file_name, file_size in zip(file_names, file_sizes))
+        )
+        
+        for row in rows:
+            append(row)
+            if len(parts) >= LISTING_CHUNK_ROWS:
+                yield "".join(parts)
+                parts.clear()
+                
+        append(f"\n{len(dirs)} DIR(s), {len(file_names)} FILE(s)\n")
+        yield "".join(parts)
+        
+    def _enter_directory(self, path):
+        """Make path the current directory and update the prompt"""
+        # Interned so the dict lookups keyed on the current directory hit by identity
+        self.current_dir = sys.intern(path)
+        self.prompt = self.get_prompt()
         
     def change_directory(self, path):
+        device, sub_path = self._parse_path(path)
+        
         # Handle DH0: (Windows C: drive)
-        if path.upper() == "DH0:":
-            self.current_dir = "DH0:"
-            self.prompt = self.get_prompt()
+        if device == "DH0:" and not sub_path:
+            self._enter_directory("DH0:")
             return ""
             
         if not path:
@@ -343,106 +519,50 @@ class AmigaTerminal:
         if path == "..":
             if self.current_dir == "SYS:":
                 return "Already at root directory.\n"
-            # Go up one level
-            parts = self.current_dir.split(":")
-            if len(parts) > 1 and parts[1]:
-                parent_parts = parts[1].split("/")
-                if len(parent_parts) > 1:
-                    new_path = parts[0] + ":" + "/".join(parent_parts[:-1])
-                    if new_path == parts[0] + ":":
-                        new_path = parts[0] + ":"
-                    self.current_dir = new_path
-                else:
-                    self.current_dir = parts[0] + ":"
+            # Go up one level: drop the last path component, device roots go back to SYS:
+            device, _, sub_path = self.current_dir.partition(":")
+            if sub_path:
+                self._enter_directory(f"{device}:{sub_path.rpartition('/')[0]}")
             else:
-                self.current_dir = "SYS:"
-            self.prompt = self.get_prompt()
+                self._enter_directory("SYS:")
             return ""
             
         # Handle absolute paths
         if ":" in path:
             # Special handling for DH0: subdirectories
-            if path.upper().startswith("DH0:") and platform.system() == "Windows":
+            if IS_WINDOWS and device == "DH0:":
                 # Check if the path exists in the actual file system
                 try:
-                    sub_path = path[4:]  # Remove "DH0:" prefix
-                    if sub_path.startswith("/"):
-                        sub_path = sub_path[1:]
-                    fs_path = os.path.join("C:\\", sub_path.replace("/", "\\"))
-                    
-                    # Try with trailing backslash if path doesn't exist
-                    if not os.path.exists(fs_path):
-                        if not fs_path.endswith("\\") and not fs_path.endswith("/"):
-                            fs_path_alt = fs_path + "\\"
-                            if os.path.exists(fs_path_alt):
-                                fs_path = fs_path_alt
-                    
-                    if os.path.exists(fs_path) and os.path.isdir(fs_path):
-                        self.current_dir = path
-                        self.prompt = self.get_prompt()
+                    if self._dh0_to_fs(sub_path):
+                        self._enter_directory(path)
                         return ""
-                    else:
-                        # Try with trailing slash for the Amiga path
-                        if not path.endswith("/"):
-                            path_alt = path + "/"
-                            sub_path_alt = path_alt[4:]  # Remove "DH0:" prefix
-                            if sub_path_alt.startswith("/"):
-                                sub_path_alt = sub_path_alt[1:]
-                            fs_path_alt = os.path.join("C:\\", sub_path_alt.replace("/", "\\"))
-                            if os.path.exists(fs_path_alt) and os.path.isdir(fs_path_alt):
-                                self.current_dir = path_alt
-                                self.prompt = self.get_prompt()
-                                return ""
                 except Exception as e:
                     pass
                 return f"Directory {path} not found.\n"
                 
             if path in self.directories:
-                self.current_dir = path
-                self.prompt = self.get_prompt()
+                self._enter_directory(path)
                 return ""
             else:
                 return f"Directory {path} not found.\n"
                 
         # Handle relative paths
         # Special handling for DH0: subdirectories
-        if self.current_dir.startswith("DH0:") and platform.system() == "Windows":
+        current_device, current_sub_path = self._parse_path(self.current_dir)
+        if IS_WINDOWS and current_device == "DH0:":
             try:
                 # Construct the new path
-                if self.current_dir == "DH0:":
-                    new_path = f"DH0:{path}"
-                else:
+                if current_sub_path:
                     new_path = f"{self.current_dir}/{path}"
+                    sub_path = f"{current_sub_path}/{path}"
+                else:
+                    new_path = f"DH0:{path}"
+                    sub_path = path
                 
                 # Check if the path exists in the actual file system
-                sub_path = new_path[4:]  # Remove "DH0:" prefix
-                if sub_path.startswith("/"):
-                    sub_path = sub_path[1:]
-                fs_path = os.path.join("C:\\", sub_path.replace("/", "\\"))
-                
-                # Try with trailing backslash if path doesn't exist
-                if not os.path.exists(fs_path):
-                    if not fs_path.endswith("\\") and not fs_path.endswith("/"):
-                        fs_path_alt = fs_path + "\\"
-                        if os.path.exists(fs_path_alt):
-                            fs_path = fs_path_alt
-                
-                if os.path.exists(fs_path) and os.path.isdir(fs_path):
-                    self.current_dir = new_path
-                    self.prompt = self.get_prompt()
+                if self._dh0_to_fs(sub_path):
+                    self._enter_directory(new_path)
                     return ""
-                else:
-                    # Try with trailing slash for the Amiga path
-                    if not new_path.endswith("/"):
-                        new_path_alt = new_path + "/"
-                        sub_path_alt = new_path_alt[4:]  # Remove "DH0:" prefix
-                        if sub_path_alt.startswith("/"):
-                            sub_path_alt = sub_path_alt[1:]
-                        fs_path_alt = os.path.join("C:\\", sub_path_alt.replace("/", "\\"))
-                        if os.path.exists(fs_path_alt) and os.path.isdir(fs_path_alt):
-                            self.current_dir = new_path_alt
-                            self.prompt = self.get_prompt()
-                            return ""
             except Exception as e:
                 pass
             return f"Directory {path} not found.\n"
@@ -454,8 +574,7 @@ class AmigaTerminal:
             
         # Check if the new path exists in directories
         if new_path in self.directories:
-            self.current_dir = new_path
-            self.prompt = self.get_prompt()
+            self._enter_directory(new_path)
             return ""
         else:
             # Check if it's a subdirectory of current directory
@@ -464,12 +583,16 @@ class AmigaTerminal:
                     new_path = f"SYS:{path}"
                 else:
                     new_path = f"{self.current_dir}/{path}"
-                self.current_dir = new_path
-                self.prompt = self.get_prompt()
+                self._enter_directory(new_path)
                 return ""
             else:
                 return f"Directory {path} not found.\n"
             
+    def _remember(self, command_text):
+        """Add a command to the history"""
+        self.command_history.append(command_text)
+        self.commands_entered += 1
+        
     def execute_command(self, command_text):
         parts = command_text.strip().split()
         if not parts:
@@ -480,66 +603,45 @@ class AmigaTerminal:
         
         # Handle device names as CD commands (Amiga behavior)
         # If the command is just a device name (ends with :), treat it as CD
-        if cmd.endswith(':') and cmd.upper() in [d.upper() for d in self.directories]:
-            return self.change_directory(cmd)
+        if cmd.endswith(':'):
+            device = self._devices_casefold.get(cmd.casefold())
+            if device:
+                return self.change_directory(device)
         
         # Add to command history
-        self.command_history.append(command_text)
+        self._remember(command_text)
         
         # Handle commands
-        if cmd == "dir":
-            return self.list_files()
-        elif cmd == "cd":
-            return self.change_directory(" ".join(args))
-        elif cmd == "info":
-            return self.info_command()
-        elif cmd == "avail":
-            return self.avail_command()
-        elif cmd == "status":
-            return self.status_command()
-        elif cmd == "mount":
-            return self.mount_command()
-        elif cmd == "echo":
-            return " ".join(args) + "\n"
-        elif cmd == "date":
-            return str(datetime.now()) + "\n"
-        elif cmd == "help":
-            return self.help_command()
-        elif cmd == "amiga":
-            return self.amiga_command()
-        elif cmd == "ping":
-            return self.ping_command(args)
-        elif cmd == "pattern":
-            return self.pattern_command(args)
-        elif cmd == "cls" or cmd == "clear":
-            return {"action": "clear"}
+        handler = self._dispatch.get(cmd)
+        if handler:
+            return handler(args)
+        return f"Command '{cmd}' not found. Type 'help' for available commands.\n"
+            
+    def execute_command_stream(self, command_text):
+        """Execute a command, yielding its output in chunks (DIR listings stream row batches)"""
+        parts = command_text.split()
+        if parts and parts[0].lower() == "dir":
+            self._remember(command_text)
+            yield from self.list_files_stream()
         else:
-            return f"Command '{cmd}' not found. Type 'help' for available commands.\n"
+            yield self.execute_command(command_text)
             
     def get_available_commands(self):
         """Return list of available commands for autocomplete"""
-        return sorted(["info", "avail", "status", "mount", "ed", "dir", "cd", "pattern", 
-                      "date", "echo", "help", "amiga", "ping", "cls", "clear"])
+        return AVAILABLE_COMMANDS
                       
     def get_directory_contents(self, path_prefix):
         """Get directory contents for autocomplete"""
         # Handle DH0: with actual file system access
-        if path_prefix.startswith("DH0:"):
-            if platform.system() == "Windows":
+        device, sub_path = self._parse_path(path_prefix)
+        if device == "DH0:":
+            if IS_WINDOWS:
                 try:
                     # Determine the actual file system path
-                    if path_prefix == "DH0:":
-                        fs_path = "C:\\"
-                        search_prefix = ""
-                    else:
-                        # Extract subdirectory path from DH0:subdir format
-                        sub_path = path_prefix[4:]  # Remove "DH0:" prefix
-                        if sub_path.startswith("/"):
-                            sub_path = sub_path[1:]
-                        fs_path = os.path.join("C:\\", sub_path.replace("/", "\\"))
-                        search_prefix = path_prefix
+                    fs_path = self._dh0_to_fs(sub_path)
+                    search_prefix = path_prefix if sub_path else ""
                         
-                    if os.path.exists(fs_path) and os.path.isdir(fs_path):
+                    if fs_path:
                         # Get parent directory to list contents
                         if search_prefix and not search_prefix.endswith("/") and not search_prefix.endswith("\\"):
                             parent_path = os.path.dirname(fs_path)
@@ -549,11 +651,9 @@ class AmigaTerminal:
                             parent_path = fs_path
                             partial_name = ""
                             
-                        items = os.listdir(parent_path)
                         matches = []
-                        for item in items:
+                        for item, is_dir, _ in self._scan_fs(parent_path):
                             if not partial_name or item.startswith(partial_name):
-                                item_path = os.path.join(parent_path, item)
                                 if search_prefix:
                                     if partial_name:
                                         # Replace the partial name with the full match
@@ -571,7 +671,7 @@ class AmigaTerminal:
                                     full_path = f"DH0:{item}"
                                 
                                 # Add trailing slash for directories
-                                if os.path.isdir(item_path):
+                                if is_dir:
                                     matches.append(full_path + "/")
                                 else:
                                     matches.append(full_path)
@@ -581,57 +681,27 @@ class AmigaTerminal:
                     pass
             
             # Fallback to placeholder content for DH0:
-            matches = []
-            # Add directories
-            for dir_name in self.directories.get("DH0:", []):
-                full_path = f"DH0:{dir_name}/"
-                if full_path.startswith(path_prefix):
-                    matches.append(full_path)
-            
-            # Add files
-            for file_path in self.files:
-                if file_path.startswith("DH0:"):
-                    file_name = file_path[4:]  # Remove "DH0:" prefix
-                    if "/" not in file_name:  # Only direct children
-                        full_path = f"DH0:{file_name}"
-                        if full_path.startswith(path_prefix):
-                            matches.append(full_path)
-            return matches
+            if not path_prefix.startswith("DH0:"):
+                return []
             
         # Handle other devices with placeholder content
-        for device in self.directories:
-            if path_prefix.startswith(device):
-                matches = []
-                # Add directories
-                for dir_name in self.directories[device]:
-                    full_path = f"{device}{dir_name}/"
-                    if full_path.startswith(path_prefix):
-                        matches.append(full_path)
-                
-                # Add files
-                for file_path in self.files:
-                    if file_path.startswith(device):
-                        file_name = file_path[len(device):]
-                        if "/" not in file_name:  # Only direct children
-                            full_path = f"{device}{file_name}"
-                            if full_path.startswith(path_prefix):
-                                matches.append(full_path)
-                return matches
+        device, sep, name_prefix = path_prefix.partition(":")
+        device += sep
+        if sep and device in self.directories:
+            return self._complete_children(device, name_prefix, device)
         
         # Handle relative paths (no device specified)
         # For relative paths, we autocomplete with items in current directory
         matches = []
         
         # Handle DH0: with actual file system
-        if self.current_dir == "DH0:" and platform.system() == "Windows":
+        if IS_WINDOWS and self.current_dir == "DH0:":
             try:
-                fs_path = "C:\\"
-                if os.path.exists(fs_path) and os.path.isdir(fs_path):
-                    items = os.listdir(fs_path)
-                    for item in items:
+                fs_path = self._dh0_to_fs("")
+                if fs_path:
+                    for item, is_dir, _ in self._scan_fs(fs_path):
                         if item.startswith(path_prefix):
-                            item_path = os.path.join(fs_path, item)
-                            if os.path.isdir(item_path):
+                            if is_dir:
                                 matches.append(item + "/")
                             else:
                                 matches.append(item)
@@ -640,64 +710,35 @@ class AmigaTerminal:
                 pass  # Fall back to placeholder matching
         
         # Handle other devices with placeholder content
-        # Add directories in current directory
-        if self.current_dir in self.directories:
-            for dir_name in self.directories[self.current_dir]:
-                if dir_name.startswith(path_prefix):
-                    matches.append(dir_name + "/")
+        return self._complete_children(self.current_dir, path_prefix)
         
-        # Add files in current directory
-        for file_path in self.files:
-            if file_path.startswith(self.current_dir + "/"):
-                file_name = file_path[len(self.current_dir) + 1:]
-                if "/" not in file_name and file_name.startswith(path_prefix):  # Only direct children
-                    matches.append(file_name)
+    def _complete_children(self, directory, name_prefix, base=""):
+        """Return entries of a virtual directory starting with name_prefix, prefixed with base"""
+        # Both name lists are sorted, so the candidates sharing the prefix
+        # are one bisected range; paths are only built for matches
+        dir_names = self._sorted_dirs.get(directory, ())
+        if name_prefix.endswith("/"):
+            # An already completed directory name ("Prefs/") completes to itself
+            dir_name = name_prefix[:-1]
+            start = bisect.bisect_left(dir_names, dir_name)
+            stop = start + 1 if start < len(dir_names) and dir_names[start] == dir_name else start
+        else:
+            start, stop = prefix_range(dir_names, name_prefix)
+        # Add directories
+        matches = [f"{base}{dir_name}/" for dir_name in itertools.islice(dir_names, start, stop)]
         
+        # Add files
+        file_names = self._children.get(directory, NO_FILES)[0]
+        start, stop = prefix_range(file_names, name_prefix)
+        matches.extend(base + file_name for file_name in itertools.islice(file_names, start, stop))
         return matches
             
     def info_command(self):
         """System information command with actual machine info"""
-        # Get system information
-        system_info = f"""System: {platform.system()} {platform.release()}
-Processor: {platform.processor() or 'Unknown'}
-Machine: {platform.machine()}
-Node Name: {platform.node()}
-Python Version: {platform.python_version()}
-"""
-        
-        # Try to get memory information on Windows
-        memory_info = ""
-        if platform.system() == "Windows":
-            try:
-                import psutil
-                memory = psutil.virtual_memory()
-                memory_info = f"Memory: {memory.total // (1024**3)}GB RAM\n"
-            except ImportError:
-                memory_info = "Memory: Unknown (install psutil for detailed info)\n"
-        else:
-            memory_info = "Memory: Unknown\n"
-            
-        return f"""Amiga 3.1
-Copyright (C) 1985-1995 Commodore-Amiga, Inc.
-WSA Terminal - Windows Subsystem for Amiga v{WSA_VERSION}
-
-System Information:
-  CPU: Motorola 68020 @ 25MHz
-  RAM: 8MB Chip + 4MB Fast
-  OS: AmigaOS 3.1
-  WB: Workbench 3.1
-  CLI: Amiga Shell 3.1
-
-Actual System Information:
-  {system_info}  {memory_info}"""
+        return INFO_HEADER + host_system_info()
         
     def avail_command(self):
-        output = "Available commands:\n"
-        commands = sorted(["info", "avail", "status", "mount", "ed", "dir", "cd", "pattern", 
-                          "date", "echo", "help", "amiga", "ping", "cls", "clear", "execute"])
-        for cmd in commands:
-            output += f"  {cmd}\n"
-        return output
+        return AVAIL_OUTPUT
         
     def status_command(self):
         return """System Status:
@@ -712,13 +753,14 @@ Actual System Information:
 """
         
     def mount_command(self):
-        output = "Mounted volumes:\n"
+        parts = ["Mounted volumes:\n"]
+        append = parts.append
         for vol in self.directories:
             if vol == "DH0:":
-                output += f"  {vol} (Windows C: Drive)\n"
+                append(f"  {vol} (Windows C: Drive)\n")
             else:
-                output += f"  {vol}\n"
-        return output
+                append(f"  {vol}\n")
+        return "".join(parts)
         
     def help_command(self):
         return """Available commands:
@@ -784,69 +826,40 @@ Examples:
 """
             
         pattern = args[0]
-        output = f"Files matching pattern \"{pattern}\" in {self.current_dir}:\n"
-        found = False
+        parts = [f"Files matching pattern \"{pattern}\" in {self.current_dir}:\n"]
+        append = parts.append
+        literal, matches = compile_pattern(pattern)
+        
+        # Candidate (name, is_dir) entries to match
+        candidates = None
         
         # Handle DH0: with actual file system access
-        if self.current_dir == "DH0:" and platform.system() == "Windows":
+        if IS_WINDOWS and self.current_dir == "DH0:":
             try:
-                c_drive_path = "C:\\"
-                if os.path.exists(c_drive_path):
-                    items = os.listdir(c_drive_path)
-                    for item in items:
-                        if pattern == "*" or item.startswith(pattern) or (pattern.startswith("~") and item.startswith(pattern[1:])):
-                            item_path = os.path.join(c_drive_path, item)
-                            if os.path.isdir(item_path):
-                                output += f"  {item}/ (drwx)\n"
-                            else:
-                                output += f"  {item} (rwed)\n"
-                            found = True
-                    if found:
-                        if not found:
-                            output += "  No files match the pattern.\n"
-                        return output
+                fs_path = self._dh0_to_fs("")
+                if fs_path:
+                    # One scandir pass: entry types come with the listing, no stat per name
+                    candidates = [(item, is_dir) for item, is_dir, _ in self._scan_fs(fs_path)]
             except Exception:
                 pass  # Fall back to placeholder matching
                 
-        # Check pattern type for other directories
-        if pattern == "#?":
-            # Single character files
-            for file_path in self.files:
-                if file_path.startswith(self.current_dir):
-                    file_name = file_path[len(self.current_dir) + 1:]
-                    if file_name and "/" not in file_name and len(file_name) == 1:
-                        output += f"  {file_name} (rwed)\n"
-                        found = True
-        elif pattern.startswith("~"):
-            # Files starting with pattern
-            prefix = pattern[1:]
-            for file_path in self.files:
-                if file_path.startswith(self.current_dir):
-                    file_name = file_path[len(self.current_dir) + 1:]
-                    if file_name and "/" not in file_name and file_name.startswith(prefix):
-                        output += f"  {file_name} (rwed)\n"
-                        found = True
-        elif pattern == "*":
-            # All files
-            for file_path in self.files:
-                if file_path.startswith(self.current_dir):
-                    file_name = file_path[len(self.current_dir) + 1:]
-                    if file_name and "/" not in file_name:
-                        output += f"  {file_name} (rwed)\n"
-                        found = True
-        else:
-            # Literal match
-            for file_path in self.files:
-                if file_path.startswith(self.current_dir):
-                    file_name = file_path[len(self.current_dir) + 1:]
-                    if file_name and "/" not in file_name and file_name == pattern:
-                        output += f"  {file_name} (rwed)\n"
-                        found = True
+        if candidates is None:
+            # Files directly inside the current directory, from the per-directory index.
+            # Only the sorted range sharing the pattern's literal prefix can match.
+            names = self._children.get(self.current_dir, NO_FILES)[0]
+            start, stop = prefix_range(names, literal) if literal else (0, len(names))
+            candidates = zip(itertools.islice(names, start, stop), itertools.repeat(False))
+            
+        dir_row = PATTERN_DIR_ROW.format
+        file_row = PATTERN_FILE_ROW.format
+        for name, is_dir in candidates:
+            if matches(name):
+                append(dir_row(name) if is_dir else file_row(name))
                         
-        if not found:
-            output += "  No files match the pattern.\n"
+        if len(parts) == 1:
+            append("  No files match the pattern.\n")
             
-        return output
+        return "".join(parts)
 
 # HTML content for the terminal interface
 HTML_CONTENT = """<!DOCTYPE html>
@@ -1076,6 +1089,7 @@ HTML_CONTENT = """<!DOCTYPE html>
         
         // Command history
         let commandHistory = [];
+        let historyLimit = 1000;
         let historyIndex = -1;
         
         // Available commands for autocomplete
@@ -1151,6 +1165,15 @@ HTML_CONTENT = """<!DOCTYPE html>
         socket.onmessage = function(event) {
             const data = JSON.parse(event.data);
             
+            // Several frames delivered in one message
+            if (data.type === "batch") {
+                data.frames.forEach(handleMessage);
+                return;
+            }
+            handleMessage(data);
+        };
+        
+        function handleMessage(data) {
             if (data.action === "clear") {
                 output.innerHTML = '';
                 return;
@@ -1173,6 +1196,16 @@ HTML_CONTENT = """<!DOCTYPE html>
             // Handle command history updates
             if (data.type === "history") {
                 commandHistory = data.commands;
+                historyLimit = data.limit || historyLimit;
+                return;
+            }
+            
+            // Handle a single command added to the history
+            if (data.type === "history_append") {
+                commandHistory.push(data.command);
+                if (commandHistory.length > historyLimit) {
+                    commandHistory.shift();
+                }
                 return;
             }
             
@@ -1201,7 +1234,7 @@ HTML_CONTENT = """<!DOCTYPE html>
                 }
                 return;
             }
-        };
+        }
 
         // Request autocomplete suggestions
         function requestAutocomplete() {
@@ -1318,107 +1351,148 @@ HTML_CONTENT = """<!DOCTYPE html>
 </html>
 """
 
+# The page never changes while the server runs: encode and compress it once,
+# and let browsers revalidate their cached copy by ETag
+HTML_BYTES = HTML_CONTENT.encode("utf-8")
+HTML_GZIP = gzip.compress(HTML_BYTES)
+HTML_HEADERS = {
+    "Cache-Control": "no-cache",
+    "ETag": f'"{zlib.crc32(HTML_BYTES):08x}"',
+    "Vary": "Accept-Encoding",
+}
+
+def json_dumps(obj):
+    """Serialize a websocket message, with orjson when installed"""
+    if orjson:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+def json_loads(data):
+    """Parse a websocket message, with orjson when installed"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Websocket frames whose content never changes, serialized once
+COMMANDS_FRAME = json_dumps({"type": "commands", "commands": AVAILABLE_COMMANDS})
+CLEAR_FRAME = json_dumps({"action": "clear"})
+
+def batch_frame(frames):
+    """Wrap already serialized frames into one batch message"""
+    return '{"type": "batch", "frames": [' + ", ".join(frames) + ']}'
+
+@functools.lru_cache(maxsize=None)
+def welcome_frame():
+    """Serialize the INFO welcome sent on connect, computed once per process"""
+    return json_dumps({"type": "output", "text": INFO_HEADER + host_system_info()})
+
+@functools.lru_cache(maxsize=1)
+def startup_frame(startup_output):
+    """Serialize the startup sequence output, cached by content"""
+    # Every session runs the same Startup-Sequence, so the frame is only built once
+    return json_dumps({"type": "output", "text": startup_output})
+
 async def websocket_handler(request):
-    ws = web.WebSocketResponse()
-    await ws.prepare(request)
-    
-    terminal = AmigaTerminal()
-    
-    # Send initial prompt
-    await ws.send_str(json.dumps({
-        "type": "prompt",
-        "text": terminal.get_prompt()
-    }))
-    
-    # Send command history
-    await ws.send_str(json.dumps({
-        "type": "history",
-        "commands": terminal.command_history
-    }))
+    from aiohttp import web, WSMsgType
     
-    # Send available commands for autocomplete
-    await ws.send_str(json.dumps({
-        "type": "commands",
-        "commands": terminal.get_available_commands()
-    }))
+    # Negotiate permessage-deflate: listings, HELP and the AMIGA art are
+    # plain text that compresses several times over
+    ws = web.WebSocketResponse(compress=True)
+    await ws.prepare(request)
     
-    # Send welcome message and startup sequence output
-    welcome_msg = terminal.info_command()
-    await ws.send_str(json.dumps({
-        "type": "output",
-        "text": welcome_msg
-    }))
+    # Construct the terminal in a worker thread: __init__ probes the disk
+    # and runs the startup sequence, which must not stall other sessions.
+    # The INFO welcome frame queries the host (platform, psutil) the first time
+    # it is built; that does not depend on the session, so it overlaps with the
+    # construction.
+    loop = asyncio.get_running_loop()
+    terminal, welcome = await asyncio.gather(
+        loop.run_in_executor(None, AmigaTerminal),
+        loop.run_in_executor(None, welcome_frame),
+    )
     
-    # Execute startup sequence and send output
-    startup_output = terminal._execute_startup_sequence()
-    if startup_output:
-        await ws.send_str(json.dumps({
-            "type": "output",
-            "text": startup_output
-        }))
+    # Send the connect burst as a single message: prompt, command history,
+    # available commands for autocomplete, welcome message and the output of
+    # the startup sequence run during construction
+    frames = [
+        json_dumps({"type": "prompt", "text": terminal.get_prompt()}),
+        json_dumps({"type": "history", "commands": list(terminal.command_history), "limit": HISTORY_SIZE}),
+        COMMANDS_FRAME,
+        welcome,
+    ]
+    if terminal.startup_output:
+        frames.append(startup_frame(terminal.startup_output))
+    await ws.send_str(batch_frame(frames))
     
     async for msg in ws:
         if msg.type == WSMsgType.TEXT:
             try:
-                data = json.loads(msg.data)
+                data = json_loads(msg.data)
                 if data.get("type") == "command":
                     command_text = data.get("text", "")
                     
-                    # Execute command
-                    result = terminal.execute_command(command_text)
+                    # Execute command in a worker thread, DH0: commands hit the disk.
+                    # Output arrives in chunks so large DIR listings stream to the client.
+                    entered = terminal.commands_entered
+                    chunks = terminal.execute_command_stream(command_text)
+                    result = await loop.run_in_executor(None, next, chunks, None)
                     
-                    # Send updated command history
-                    await ws.send_str(json.dumps({
-                        "type": "history",
-                        "commands": terminal.command_history
-                    }))
+                    # Send only the new history entry, the client keeps the rest.
+                    # The command list is static and was sent on connect.
+                    if terminal.commands_entered != entered:
+                        await ws.send_json({
+                            "type": "history_append",
+                            "command": command_text
+                        }, dumps=json_dumps)
                     
-                    # Send updated available commands (in case any were added)
-                    await ws.send_str(json.dumps({
-                        "type": "commands",
-                        "commands": terminal.get_available_commands()
-                    }))
-                    
-                    # Handle special actions like clear
-                    if isinstance(result, dict) and result.get("action") == "clear":
-                        await ws.send_str(json.dumps({
-                            "action": "clear"
-                        }))
-                    elif result:
-                        # Send command output
-                        await ws.send_str(json.dumps({
-                            "type": "output",
-                            "text": result
-                        }))
+                    while result is not None:
+                        # Handle special actions like clear
+                        if isinstance(result, dict) and result.get("action") == "clear":
+                            await ws.send_str(CLEAR_FRAME)
+                        elif result:
+                            # Send command output
+                            await ws.send_str(json_dumps({"type": "output", "text": result}))
+                        result = await loop.run_in_executor(None, next, chunks, None)
                     
                     # Send updated prompt
-                    await ws.send_str(json.dumps({
+                    await ws.send_json({
                         "type": "prompt",
                         "text": terminal.get_prompt()
-                    }))
+                    }, dumps=json_dumps)
                 elif data.get("type") == "autocomplete":
                     # Handle autocomplete request
                     path_prefix = data.get("text", "")
-                    matches = terminal.get_directory_contents(path_prefix)
-                    await ws.send_str(json.dumps({
+                    matches = await loop.run_in_executor(None, terminal.get_directory_contents, path_prefix)
+                    await ws.send_json({
                         "type": "autocomplete",
                         "matches": matches
-                    }))
+                    }, dumps=json_dumps)
             except Exception as e:
-                await ws.send_str(json.dumps({
+                await ws.send_json({
                     "type": "output",
                     "text": f"Error: {str(e)}\n",
                     "color": "red"
-                }))
+                }, dumps=json_dumps)
         elif msg.type == WSMsgType.ERROR:
             print(f"WebSocket error: {ws.exception()}")
     
     return ws
 
 async def index_handler(request):
-    return web.Response(text=HTML_CONTENT, content_type='text/html')
+    from aiohttp import web
+    
+    if request.headers.get("If-None-Match") == HTML_HEADERS["ETag"]:
+        return web.Response(status=304, headers=HTML_HEADERS)
+    if "gzip" in request.headers.get("Accept-Encoding", ""):
+        return web.Response(body=HTML_GZIP, content_type='text/html', charset='utf-8',
+                            headers={**HTML_HEADERS, "Content-Encoding": "gzip"})
+    return web.Response(body=HTML_BYTES, content_type='text/html', charset='utf-8', headers=HTML_HEADERS)
 
 async def init_app():
+    # aiohttp is imported by the server functions only, so the terminal
+    # class and "--help" load without it
+    from aiohttp import web
+    
     app = web.Application()
     app.router.add_get('/', index_handler)
     app.router.add_get('/ws', websocket_handler)
@@ -1431,6 +1505,12 @@ def main():
     
     args = parser.parse_args()
     
+    try:
+        from aiohttp import web
+    except ImportError:
+        print("Please install aiohttp: pip install aiohttp")
+        sys.exit(1)
+    
     print(f"Starting WSA Terminal on http://{args.host}:{args.port}")
     print("Press Ctrl+C to stop the server")
     
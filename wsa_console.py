@@ -9,16 +9,30 @@ import sys
 import cmd
 import argparse
 import platform
+import shutil
 import subprocess
-import time
+import threading
 import random
-import io
-import contextlib
 import re
+import bisect
+import functools
 import configparser
-import glob
 from datetime import datetime
 
+# Host platform, resolved once at import
+IS_WINDOWS = platform.system() == "Windows"
+IS_MACOS = platform.system() == "Darwin"
+
+# WSL exposes the Windows C: drive under /mnt/c
+IS_WSL = os.path.exists("/mnt/c")
+
+# Whether DH0: is backed by the real C: drive
+DH0_IS_REAL = IS_WSL or IS_WINDOWS
+
+# Host path of the C: drive root, and the separator swap for paths below it
+DH0_FS_ROOT = "/mnt/c/" if IS_WSL else "C:\\"
+DH0_FS_SEPARATORS = ("\\", "/") if IS_WSL else ("/", "\\")
+
 # WinUAE Configuration - Global Variables with Fallbacks
 WINUAE_CONFIG = {
     'executable_path': os.environ.get('WINUAE_PATH', r'C:\Program Files\WinUAE\winuae.exe'),
@@ -28,8 +42,150 @@ WINUAE_CONFIG = {
     'hdf_dir': os.environ.get('WINUAE_HDF_DIR', r'C:\Users\Public\Documents\Amiga Files\WinUAE\Hardfiles')
 }
 
+# Shared folder entries in emulator configs, matched over the raw file bytes
+# filesystem2=<access>,<device>:<label>:<path>,<boot priority>
+WINUAE_FILESYSTEM_PATTERN = re.compile(rb'^[ \t]*filesystem2=([^,\n]*),([^:,\n]*):([^:,\n]*):([^,\n]*),', re.MULTILINE)
+FSUAE_HARD_DRIVE_PATTERN = re.compile(rb'^[ \t]*hard_drive_(\d+)[ \t]*=[ \t]*(.*?)[ \t\r]*$', re.MULTILINE)
+
+# Common FS-UAE configuration locations
+FSUAE_CONFIG_DIRS = (
+    "~/.config/fs-uae",
+    "~/Documents/FS-UAE/Configurations",
+    "~/.fs-uae"
+)
+
+# Virtual file system every console starts with (subdirectory lists are
+# copied per instance since MAKEDIR appends to them)
+DEFAULT_DIRECTORIES = {
+    "SYS:": ("Prefs", "Tools", "L", "S", "C", "DEVS", "Fonts", "WBStartup"),
+    "SYS:S": (),  # System scripts directory
+    "SYS:L": (),  # Libraries directory  
+    "SYS:DEVS": (),  # Device drivers directory
+    "SYS:Fonts": (),  # Fonts directory
+    "SYS:Prefs": ("Env-Archive", "Env"),  # Preferences directory with Env subdirectories
+    "SYS:Prefs/Env-Archive": (),  # Environment archive directory
+    "SYS:Prefs/Env": (),  # Current environment directory
+    "RAM:": ("T",),
+    "RAM:T": (),  # Temporary files directory
+    "C:": ("Info", "Avail", "Status", "Mount", "Ed", "Dir", "Cd", "Pattern", "Date", "Echo", "Help", "Amiga", "Ping", "WinUAE", "Say", "Guru"),
+    "DH0:": ()  # Windows C: drive mapped as DH0:
+}
+DEFAULT_FILES = {
+    "SYS:Prefs/Env-Archive/PATH": "C: SYS:S SYS:C",
+    "SYS:Prefs/Env-Archive/SHELL": "WSA Terminal",
+    "SYS:Prefs/Env/PATH": "C: SYS:S SYS:C", 
+    "SYS:Prefs/Env/SHELL": "WSA Terminal",
+    "SYS:Tools/Shell-Startup": "Shell startup script",
+    "SYS:S/Startup-Sequence": "; AmigaOS-style startup sequence\n; This script runs when the WSA Terminal starts\n\n; Mount additional volumes\n; mount RAM: FROM RAM SIZE=1024\n\n; Set environment variables\n; setenv PATH C: SYS:S\n\n; Run system tools\n; execute SYS:Tools/Shell-Startup\n",
+    "RAM:T/Temp-File": "Temporary file",
+    "C:Info": "System information utility",
+    "C:Avail": "List available commands",
+    "C:Status": "Show system status",
+    "C:Mount": "Mount volumes",
+    "C:Ed": "Text editor",
+    "C:Dir": "Directory listing",
+    "C:Cd": "Change directory",
+    "C:Pattern": "Pattern matching utility",
+    "C:Date": "Show date and time",
+    "C:Echo": "Echo text to terminal",
+    "C:Help": "Display help information",
+    "C:Amiga": "Amiga easter egg command",
+    "C:Ping": "Network ping utility",
+    "C:WinUAE": "Launch WinUAE Amiga emulator",
+    "C:Say": "Text-to-speech synthesis",
+    "C:Guru": "Guru Meditation error demo"
+}
+
+# Placeholder DH0: content when the real C: drive can't be read
+DH0_PLACEHOLDER_DIRS = ("Windows", "Program Files", "Users", "Documents and Settings")
+DH0_PLACEHOLDER_FILES = {
+    "DH0:/Windows/System32/kernel32.dll": "Windows kernel library",
+    "DH0:/Windows/explorer.exe": "Windows Explorer",
+    "DH0:/Program Files/": "Program Files directory",
+    "DH0:/Users/": "Users directory"
+}
+
+# Well-known entries in the root of the Windows C: drive, shown under DH0:
+COMMON_WINDOWS_DIRS = ("Windows", "Program Files", "Users", "Documents and Settings", "Program Files (x86)")
+COMMON_WINDOWS_FILES = ("pagefile.sys", "hiberfil.sys", "swapfile.sys")
+
+# Reply time in ping output
+# Windows: "time<1ms" or "time=123ms"
+# Linux: "time=123 ms" or "time=123ms"
+PING_TIME_PATTERN = re.compile(r'time[<=](\d+(?:\.\d+)?)', re.IGNORECASE)
+
+# Packet sequence number in Linux and macOS ping output
+PING_SEQ_PATTERN = re.compile(r'icmp_seq=(\d+)', re.IGNORECASE)
+
+# "Reply from" lines that report a failure instead of a reply from the host
+# Windows: "Destination host unreachable." or "TTL expired in transit."
+PING_ERROR_REPLIES = ("unreachable", "expired", "transit")
+
+# Number of real directory listings kept for tab completion
+LISTDIR_CACHE_SIZE = 64
+
+# Chunk size for streaming real files to the terminal with TYPE
+TYPE_CHUNK_SIZE = 256 * 1024
+
+# Logical assignments (common Amiga directory shortcuts)
+LOGICAL_ASSIGNMENTS = {
+    "S:": "SYS:S",
+    "L:": "SYS:L",
+    "DEVS:": "SYS:DEVS",
+    "FONTS:": "SYS:Fonts",
+    "T:": "RAM:T"
+}
+
+# Multi-line help texts, printed in one go
+MOUNT_USAGE = """Usage:
+  MOUNT                                    - Show mounted volumes
+  MOUNT <device> FROM WINUAE <config>     - Mount WinUAE shared folder
+  MOUNT <device> FROM FS-UAE <config>     - Mount FS-UAE shared folder
+  MOUNT LIST WINUAE                       - List WinUAE configurations
+  MOUNT LIST FS-UAE                       - List FS-UAE configurations
+  MOUNT UNMOUNT <device>                  - Unmount shared folder
+
+Examples:
+  MOUNT SHARED: FROM WINUAE "My A1200 Config"
+  MOUNT UAE0: FROM FS-UAE "Workbench31.fs-uae"
+  MOUNT LIST WINUAE
+  MOUNT UNMOUNT SHARED:"""
+
+MOUNT_FROM_USAGE = '''
+Usage:
+  MOUNT <device> FROM WINUAE "<config_name>"
+  MOUNT <device> FROM FS-UAE "<config_name>"'''
+
+WINUAE_NOT_FOUND_HELP = """ERROR: WinUAE executable not found!
+
+Please install WinUAE or set the WINUAE_PATH environment variable:
+  set WINUAE_PATH=C:\\Path\\To\\Your\\winuae.exe
+
+Common installation paths:
+  C:\\Program Files\\WinUAE\\winuae.exe
+  C:\\Program Files (x86)\\WinUAE\\winuae.exe"""
+
+WINUAE_USAGE = """
+Usage: WINUAE [config_name]
+       WINUAE LIST
+       WINUAE CONFIG"""
+
+PING_USAGE = """Usage: PING <host> [COUNT=n]
+Examples:
+  PING google.com
+  PING 8.8.8.8 COUNT=5
+  PING 127.0.0.1 COUNT=1"""
+
+SAY_USAGE = """Usage: SAY <text> [RATE=n] [VOICE=name]
+Examples:
+  SAY "Hello from Amiga"
+  SAY "Welcome to WSA Terminal" RATE=150
+  SAY "Greetings" VOICE=female
+  SAY VOICES  (list available voices)"""
+
+@functools.lru_cache(maxsize=1)
 def get_winuae_executable():
-    """Get the WinUAE executable path with fallback search"""
+    """Get the WinUAE executable path with fallback search (cached)"""
     # Try environment variable first
     winuae_path = WINUAE_CONFIG['executable_path']
     if os.path.exists(winuae_path):
@@ -49,33 +205,124 @@ def get_winuae_executable():
     
     return None
 
+@functools.lru_cache(maxsize=None)
+def expand_path(path):
+    """Expand ~ and environment variables in a configured path"""
+    return os.path.expandvars(os.path.expanduser(path))
+
+@functools.lru_cache(maxsize=32)
+def normalize_device(name):
+    """Upper-case a device name and make sure it ends with ':'"""
+    device = name.upper()
+    return device if device.endswith(':') else device + ':'
+
+def prefix_range(names, prefix):
+    """Return the slice bounds of the entries in sorted names that start with prefix"""
+    lo = bisect.bisect_left(names, prefix)
+    return lo, bisect.bisect_left(names, prefix + "\U0010ffff", lo)
+
+@functools.lru_cache(maxsize=4096)
+def dh0_to_fs_path(amiga_path):
+    """Map a DH0: path to the real C: drive (under /mnt/c on WSL)"""
+    sub_path = amiga_path[4:].lstrip("/")  # Remove "DH0:" prefix and leading slashes
+    return os.path.normpath(DH0_FS_ROOT + sub_path.replace(*DH0_FS_SEPARATORS))
+
+@functools.lru_cache(maxsize=2048)
+def resolve_path(current_dir, path):
+    """Resolve a relative or absolute path against current_dir (cached)"""
+    if not path:
+        return current_dir
+        
+    # Handle absolute paths (with device:)
+    if ":" in path:
+        # Check if this is a logical assignment
+        logical, _, remaining_path = path.partition(":")
+        actual = LOGICAL_ASSIGNMENTS.get(logical.upper() + ":")
+        if actual is not None:
+            # Replace the logical assignment with the actual path
+            if remaining_path:
+                return f"{actual}/{remaining_path}"
+            else:
+                return actual
+        
+        return path
+        
+    # Handle relative paths
+    current_upper = current_dir.upper()
+    if current_upper == "DH0:":
+        return f"DH0:/{path}"
+    elif current_upper.startswith("DH0:"):
+        return f"{current_dir}/{path}"
+    elif current_dir.endswith(":"):
+        return f"{current_dir}{path}"
+    else:
+        return f"{current_dir}/{path}"
+
+@functools.lru_cache(maxsize=2048)
+def resolve_file_path(current_dir, filename):
+    """Resolve filename to full path against current_dir (cached)"""
+    # Handle absolute paths
+    if ":" in filename:
+        return filename
+        
+    # Handle relative paths
+    if current_dir.endswith(":"):
+        return f"{current_dir}{filename}"
+    else:
+        return f"{current_dir}/{filename}"
+
+def unquote(text):
+    """Remove one pair of matching surrounding quotes, if present"""
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in '"\'':
+        return text[1:-1]
+    return text
+
+def ps_quote(text):
+    """Quote text as a PowerShell single-quoted string literal"""
+    return "'" + text.replace("'", "''") + "'"
+
+def get_winuae_config_dir():
+    """Get the expanded WinUAE configuration directory"""
+    return expand_path(WINUAE_CONFIG['config_dir'])
+
 def get_winuae_config_path(config_name=None):
     """Get the full path to a WinUAE configuration file"""
     if config_name is None:
         config_name = WINUAE_CONFIG['default_config']
     
-    config_dir = WINUAE_CONFIG['config_dir']
-    
-    # Try to expand user paths
-    config_dir = os.path.expanduser(config_dir)
-    config_dir = os.path.expandvars(config_dir)
-    
-    return os.path.join(config_dir, config_name)
+    return os.path.join(get_winuae_config_dir(), config_name)
 
-def list_winuae_configs():
-    """List available WinUAE configuration files"""
-    config_dir = WINUAE_CONFIG['config_dir']
-    config_dir = os.path.expanduser(config_dir)
-    config_dir = os.path.expandvars(config_dir)
-    
-    if not os.path.exists(config_dir):
-        return []
-    
+@functools.lru_cache(maxsize=1)
+def scan_winuae_config_dir(config_dir, stamp):
+    """List the .uae files in config_dir; stamp is its mtime and keys the cache"""
     try:
-        files = os.listdir(config_dir)
-        return [f for f in files if f.lower().endswith('.uae')]
+        with os.scandir(config_dir) as it:
+            return tuple(entry.name for entry in it
+                         if entry.name.lower().endswith('.uae') and entry.is_file())
     except Exception:
+        return ()
+
+def list_winuae_configs():
+    """List available WinUAE configuration files, rescanned only when the directory changes"""
+    config_dir = get_winuae_config_dir()
+    try:
+        stamp = os.stat(config_dir).st_mtime_ns
+    except OSError:
         return []
+    return list(scan_winuae_config_dir(config_dir, stamp))
+
+def winuae_config_exists(config_path):
+    """Check for a WinUAE configuration file against the cached directory listing"""
+    config_dir, config_name = os.path.split(config_path)
+    if config_dir != get_winuae_config_dir():
+        # Outside the config directory, so not covered by the listing
+        return os.path.exists(config_path)
+    
+    if IS_WINDOWS:
+        # Windows file names are case-insensitive
+        config_name = config_name.lower()
+        return any(name.lower() == config_name for name in list_winuae_configs())
+    return config_name in list_winuae_configs()
 
 
 class EmulatorSharedFolder:
@@ -83,91 +330,111 @@ class EmulatorSharedFolder:
     
     def __init__(self):
         self.mounted_shared_folders = {}
-        self.winuae_configs = {}
-        self.fsuae_configs = {}
-        self._scan_emulator_configs()
+        # Configs are scanned on first use and rescanned only when a config
+        # file is added, removed or edited
+        self._winuae_configs = None
+        self._fsuae_configs = None
+        self._winuae_stamp = None
+        self._fsuae_stamp = None
+    
+    @staticmethod
+    def _config_stamp(dirs, suffix):
+        """Return the path, mtime and size of every config file in the given directories"""
+        # Editing a config does not touch its directory's mtime, so each file is stamped
+        stamp = []
+        for config_dir in dirs:
+            try:
+                with os.scandir(config_dir) as it:
+                    for entry in it:
+                        if entry.name.lower().endswith(suffix) and entry.is_file():
+                            stat = entry.stat()
+                            stamp.append((entry.path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                continue
+        stamp.sort()
+        return tuple(stamp)
     
-    def _scan_emulator_configs(self):
-        """Scan for available WinUAE and FS-UAE configurations"""
-        self._scan_winuae_configs()
-        self._scan_fsuae_configs()
+    @property
+    def winuae_configs(self):
+        """WinUAE configurations with shared folders, scanned on demand"""
+        config_dir = get_winuae_config_dir()
+        stamp = self._config_stamp((config_dir,), '.uae')
+        if self._winuae_configs is None or stamp != self._winuae_stamp:
+            self._winuae_configs = {}
+            self._winuae_stamp = stamp
+            self._scan_winuae_configs(config_dir)
+        return self._winuae_configs
     
-    def _scan_winuae_configs(self):
+    @property
+    def fsuae_configs(self):
+        """FS-UAE configurations with shared folders, scanned on demand"""
+        fsuae_dirs = tuple(expand_path(config_dir) for config_dir in FSUAE_CONFIG_DIRS)
+        stamp = self._config_stamp(fsuae_dirs, '.fs-uae')
+        if self._fsuae_configs is None or stamp != self._fsuae_stamp:
+            self._fsuae_configs = {}
+            self._fsuae_stamp = stamp
+            self._scan_fsuae_configs(fsuae_dirs)
+        return self._fsuae_configs
+    
+    def _scan_winuae_configs(self, config_dir):
         """Scan for WinUAE configuration files and extract shared folders"""
-        config_dir = WINUAE_CONFIG['config_dir']
-        config_dir = os.path.expanduser(config_dir)
-        config_dir = os.path.expandvars(config_dir)
-        
-        if not os.path.exists(config_dir):
-            return
-        
         try:
-            for config_file in glob.glob(os.path.join(config_dir, "*.uae")):
-                config_name = os.path.basename(config_file)
-                shared_folders = self._parse_winuae_config(config_file)
-                if shared_folders:
-                    self.winuae_configs[config_name] = {
-                        'path': config_file,
-                        'shared_folders': shared_folders
-                    }
+            with os.scandir(config_dir) as it:
+                for entry in it:
+                    config_name = entry.name
+                    if not config_name.lower().endswith('.uae') or not entry.is_file():
+                        continue
+                    config_file = entry.path
+                    shared_folders = self._parse_winuae_config(config_file)
+                    if shared_folders:
+                        self._winuae_configs[config_name] = {
+                            'path': config_file,
+                            'shared_folders': shared_folders
+                        }
+        except FileNotFoundError:
+            return
         except Exception as e:
             print(f"Warning: Error scanning WinUAE configs: {e}")
     
-    def _scan_fsuae_configs(self):
+    def _scan_fsuae_configs(self, fsuae_dirs):
         """Scan for FS-UAE configuration files and extract shared folders"""
-        # Common FS-UAE config locations
-        fsuae_dirs = [
-            os.path.expanduser("~/.config/fs-uae"),
-            os.path.expanduser("~/Documents/FS-UAE/Configurations"),
-            os.path.expanduser("~/.fs-uae")
-        ]
-        
         for config_dir in fsuae_dirs:
-            if os.path.exists(config_dir):
-                try:
-                    for config_file in glob.glob(os.path.join(config_dir, "*.fs-uae")):
-                        config_name = os.path.basename(config_file)
+            try:
+                with os.scandir(config_dir) as it:
+                    for entry in it:
+                        config_name = entry.name
+                        if not config_name.lower().endswith('.fs-uae') or not entry.is_file():
+                            continue
+                        config_file = entry.path
                         shared_folders = self._parse_fsuae_config(config_file)
                         if shared_folders:
-                            self.fsuae_configs[config_name] = {
+                            self._fsuae_configs[config_name] = {
                                 'path': config_file,
                                 'shared_folders': shared_folders
                             }
-                except Exception as e:
-                    print(f"Warning: Error scanning FS-UAE configs in {config_dir}: {e}")
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                print(f"Warning: Error scanning FS-UAE configs in {config_dir}: {e}")
     
     def _parse_winuae_config(self, config_file):
         """Parse WinUAE .uae configuration file for shared folders"""
         shared_folders = {}
         
         try:
-            with open(config_file, 'r', encoding='utf-8', errors='ignore') as f:
-                for line in f:
-                    line = line.strip()
-                    # Look for filesystem2= entries (WinUAE shared folders)
-                    if line.startswith('filesystem2='):
-                        # Format: filesystem2=rw,DH0:Label:C:\Path,0
-                        try:
-                            parts = line.split('=', 1)[1].split(',')
-                            if len(parts) >= 3:
-                                access_mode = parts[0]  # rw, ro, etc.
-                                device_info = parts[1]  # DH0:Label:Path
-                                
-                                if ':' in device_info:
-                                    device_parts = device_info.split(':', 2)
-                                    if len(device_parts) >= 3:
-                                        device = device_parts[0] + ":"
-                                        label = device_parts[1]
-                                        path = device_parts[2]
-                                        
-                                        if os.path.exists(path):
-                                            shared_folders[device] = {
-                                                'label': label,
-                                                'path': path,
-                                                'access': access_mode
-                                            }
-                        except Exception:
-                            continue
+            with open(config_file, 'rb') as f:
+                data = f.read()
+            # Look for filesystem2= entries (WinUAE shared folders)
+            for match in WINUAE_FILESYSTEM_PATTERN.finditer(data):
+                # Format: filesystem2=rw,DH0:Label:C:\Path,0
+                access_mode, device, label, path = [group.decode('utf-8', 'ignore') for group in match.groups()]
+                
+                if os.path.exists(path):
+                    shared_folders[device + ":"] = {
+                        'label': label,
+                        'path': path,
+                        'access': access_mode
+                    }
         except Exception as e:
             print(f"Warning: Could not parse WinUAE config {config_file}: {e}")
         
@@ -178,40 +445,26 @@ class EmulatorSharedFolder:
         shared_folders = {}
         
         try:
-            with open(config_file, 'r', encoding='utf-8', errors='ignore') as f:
-                for line in f:
-                    line = line.strip()
-                    # Look for hard_drive_* entries
-                    if line.startswith('hard_drive_') and '=' in line:
-                        try:
-                            key, value = line.split('=', 1)
-                            key = key.strip()
-                            value = value.strip()
-                            
-                            # Extract drive number
-                            if '_' in key:
-                                drive_num = key.split('_')[-1]
-                                
-                                # Skip if it's a label definition
-                                if key.endswith('_label'):
-                                    continue
-                                
-                                # Check if it's a directory path (not a file)
-                                if os.path.isdir(value):
-                                    device = f"DH{drive_num}:"
-                                    
-                                    # Look for corresponding label
-                                    label = f"Drive{drive_num}"
-                                    # This is simplified - in a full implementation,
-                                    # we'd parse the entire file to match labels
-                                    
-                                    shared_folders[device] = {
-                                        'label': label,
-                                        'path': value,
-                                        'access': 'rw'
-                                    }
-                        except Exception:
-                            continue
+            with open(config_file, 'rb') as f:
+                data = f.read()
+            # Look for hard_drive_N entries; hard_drive_N_label lines don't match
+            for drive_num, value in FSUAE_HARD_DRIVE_PATTERN.findall(data):
+                drive_num = drive_num.decode('ascii')
+                value = value.decode('utf-8', 'ignore')
+                # Check if it's a directory path (not a file)
+                if os.path.isdir(value):
+                    device = f"DH{drive_num}:"
+                    
+                    # Look for corresponding label
+                    label = f"Drive{drive_num}"
+                    # This is simplified - in a full implementation,
+                    # we'd parse the entire file to match labels
+                    
+                    shared_folders[device] = {
+                        'label': label,
+                        'path': value,
+                        'access': 'rw'
+                    }
         except Exception as e:
             print(f"Warning: Could not parse FS-UAE config {config_file}: {e}")
         
@@ -219,13 +472,11 @@ class EmulatorSharedFolder:
     
     def mount_shared_folder(self, device, emulator_type, config_name):
         """Mount a shared folder from emulator configuration"""
-        device = device.upper()
-        if not device.endswith(':'):
-            device += ':'
+        device = normalize_device(device)
         
         if emulator_type.lower() == 'winuae':
-            if config_name in self.winuae_configs:
-                config = self.winuae_configs[config_name]
+            config = self.winuae_configs.get(config_name)
+            if config is not None:
                 if device in config['shared_folders']:
                     folder_info = config['shared_folders'][device]
                     self.mounted_shared_folders[device] = {
@@ -242,8 +493,8 @@ class EmulatorSharedFolder:
                 return False, f"WinUAE config '{config_name}' not found"
         
         elif emulator_type.lower() == 'fs-uae':
-            if config_name in self.fsuae_configs:
-                config = self.fsuae_configs[config_name]
+            config = self.fsuae_configs.get(config_name)
+            if config is not None:
                 if device in config['shared_folders']:
                     folder_info = config['shared_folders'][device]
                     self.mounted_shared_folders[device] = {
@@ -264,9 +515,7 @@ class EmulatorSharedFolder:
     
     def unmount_shared_folder(self, device):
         """Unmount a shared folder"""
-        device = device.upper()
-        if not device.endswith(':'):
-            device += ':'
+        device = normalize_device(device)
         
         if device in self.mounted_shared_folders:
             del self.mounted_shared_folders[device]
@@ -296,9 +545,7 @@ class EmulatorSharedFolder:
     
     def get_shared_folder_path(self, device):
         """Get the real path for a mounted shared folder device"""
-        device = device.upper()
-        if not device.endswith(':'):
-            device += ':'
+        device = normalize_device(device)
         
         if device in self.mounted_shared_folders:
             return self.mounted_shared_folders[device]['path']
@@ -325,100 +572,85 @@ Type 'help' or '?' for available commands.
         cmd = cmd.lower()
         self.lastcmd = line
         
-        if cmd == '':
+        func = self._cmd_table.get(cmd)
+        if func is None:
             return self.default(line)
-        else:
-            try:
-                func = getattr(self, 'do_' + cmd)
-            except AttributeError:
-                return self.default(line)
-            return func(arg)
+        return func(self, arg)
+    
+    @classmethod
+    def _build_cmd_table(cls):
+        """Map command names to do_* functions, once per class"""
+        if '_cmd_table' not in cls.__dict__:
+            cls._cmd_table = {name[3:]: getattr(cls, name) for name in dir(cls) if name.startswith('do_')}
     
     def __init__(self):
         super().__init__()
+        
+        # Command name -> do_* function, shared by all instances of the class
+        self._build_cmd_table()
         self.current_dir = "SYS:"
         self.prompt = "SYS:> "
         
         # Initialize emulator shared folder integration
         self.emulator_integration = EmulatorSharedFolder()
         
-        # Add Windows C: drive by default
-        self.directories = {
-            "SYS:": ["Prefs", "Tools", "L", "S", "C", "DEVS", "Fonts", "WBStartup"],
-            "SYS:S": [],  # System scripts directory
-            "SYS:L": [],  # Libraries directory  
-            "SYS:DEVS": [],  # Device drivers directory
-            "SYS:Fonts": [],  # Fonts directory
-            "SYS:Prefs": ["Env-Archive", "Env"],  # Preferences directory with Env subdirectories
-            "SYS:Prefs/Env-Archive": [],  # Environment archive directory
-            "SYS:Prefs/Env": [],  # Current environment directory
-            "RAM:": ["T"],
-            "RAM:T": [],  # Temporary files directory
-            "C:": ["Info", "Avail", "Status", "Mount", "Ed", "Dir", "Cd", "Pattern", "Date", "Echo", "Help", "Amiga", "Ping", "WinUAE", "Say", "Guru"],
-            "DH0:": []  # Windows C: drive mapped as DH0:
-        }
-        self.files = {
-            "SYS:Prefs/Env-Archive/PATH": "C: SYS:S SYS:C",
-            "SYS:Prefs/Env-Archive/SHELL": "WSA Terminal",
-            "SYS:Prefs/Env/PATH": "C: SYS:S SYS:C", 
-            "SYS:Prefs/Env/SHELL": "WSA Terminal",
-            "SYS:Tools/Shell-Startup": "Shell startup script",
-            "SYS:S/Startup-Sequence": "; AmigaOS-style startup sequence\n; This script runs when the WSA Terminal starts\n\n; Mount additional volumes\n; mount RAM: FROM RAM SIZE=1024\n\n; Set environment variables\n; setenv PATH C: SYS:S\n\n; Run system tools\n; execute SYS:Tools/Shell-Startup\n",
-            "RAM:T/Temp-File": "Temporary file",
-            "C:Info": "System information utility",
-            "C:Avail": "List available commands",
-            "C:Status": "Show system status",
-            "C:Mount": "Mount volumes",
-            "C:Ed": "Text editor",
-            "C:Dir": "Directory listing",
-            "C:Cd": "Change directory",
-            "C:Pattern": "Pattern matching utility",
-            "C:Date": "Show date and time",
-            "C:Echo": "Echo text to terminal",
-            "C:Help": "Display help information",
-            "C:Amiga": "Amiga easter egg command",
-            "C:Ping": "Network ping utility",
-            "C:WinUAE": "Launch WinUAE Amiga emulator",
-            "C:Say": "Text-to-speech synthesis",
-            "C:Guru": "Guru Meditation error demo"
-        }
+        # Start from the default virtual file system
+        self.directories = {path: list(subdirs) for path, subdirs in DEFAULT_DIRECTORIES.items()}
+        self.files = dict(DEFAULT_FILES)
         
         # Add Windows C: drive files if we're on Windows
-        if platform.system() == "Windows":
+        if IS_WINDOWS:
             # Try to get actual C: drive contents
             try:
-                c_drive_path = "C:\\"
-                if os.path.exists(c_drive_path):
-                    self.directories["DH0:"] = []
-                    # Add some common Windows directories
-                    common_dirs = ["Windows", "Program Files", "Users", "Documents and Settings", "Program Files (x86)"]
-                    for dir_name in common_dirs:
-                        if os.path.exists(os.path.join(c_drive_path, dir_name)):
-                            self.directories["DH0:"].append(dir_name)
-                    
-                    # Add some common files
-                    common_files = ["pagefile.sys", "hiberfil.sys", "swapfile.sys"]
-                    for file_name in common_files:
-                        if os.path.exists(os.path.join(c_drive_path, file_name)):
-                            self.files[f"DH0:/{file_name}"] = f"System file: {file_name}"
+                # One scan of the drive root instead of a stat per candidate
+                present = set()
+                with os.scandir("C:\\") as it:
+                    for entry in it:
+                        present.add(entry.name)
+                # Add some common Windows directories
+                self.directories["DH0:"] = [d for d in COMMON_WINDOWS_DIRS if d in present]
+                
+                # Add some common files
+                for file_name in COMMON_WINDOWS_FILES:
+                    if file_name in present:
+                        self.files[f"DH0:/{file_name}"] = f"System file: {file_name}"
+            except FileNotFoundError:
+                pass
             except Exception:
                 # Fallback to placeholder content
-                self.directories["DH0:"] = ["Windows", "Program Files", "Users", "Documents and Settings"]
-                self.files.update({
-                    "DH0:/Windows/System32/kernel32.dll": "Windows kernel library",
-                    "DH0:/Windows/explorer.exe": "Windows Explorer",
-                    "DH0:/Program Files/": "Program Files directory",
-                    "DH0:/Users/": "Users directory"
-                })
+                self.directories["DH0:"] = list(DH0_PLACEHOLDER_DIRS)
+                self.files.update(DH0_PLACEHOLDER_FILES)
         else:
             # For non-Windows systems, add placeholder content
-            self.directories["DH0:"] = ["Windows", "Program Files", "Users", "Documents and Settings"]
-            self.files.update({
-                "DH0:/Windows/System32/kernel32.dll": "Windows kernel library",
-                "DH0:/Windows/explorer.exe": "Windows Explorer",
-                "DH0:/Program Files/": "Program Files directory",
-                "DH0:/Users/": "Users directory"
-            })
+            self.directories["DH0:"] = list(DH0_PLACEHOLDER_DIRS)
+            self.files.update(DH0_PLACEHOLDER_FILES)
+        
+        # Sorted virtual file names grouped by the directory prefix they live
+        # under, and sorted subdirectory names built on demand, for completion
+        self._files_by_dir = {}
+        self._subdirs_sorted = {}
+        for file_path in self.files:
+            self._index_file(file_path)
+        
+        # Upper-cased directory names, for case-insensitive device lookups
+        self._devices_upper = {d.upper(): d for d in self.directories}
+        
+        # Real directory listings for DH0: completion, keyed by path, and the
+        # paths already checked against their mtime for the line being typed
+        self._listdir_cache = {}
+        self._listdir_checked = set()
+        
+        # SAY backends found on this system, probed on first use
+        self._tts_backends = None
+        
+        # In-process SAPI voice for SAY on Windows, created on first use
+        # (False once comtypes or the COM object turned out to be unavailable)
+        self._sapi_voice = None
+        self._sapi_default_voice = None
+        
+        # pyttsx3 engine for SAY, initialised on first use (False if unavailable)
+        self._pyttsx3_engine = None
+        self._pyttsx3_defaults = None
         
         # Execute startup sequence
         self._execute_startup_sequence()
@@ -435,7 +667,7 @@ Type 'help' or '?' for available commands.
             return
             
         # Check for actual file in DH0: (Windows C: drive)
-        if platform.system() == "Windows":
+        if IS_WINDOWS:
             try:
                 fs_path = os.path.join("C:\\", "S", "Startup-Sequence")
                 if os.path.exists(fs_path):
@@ -470,84 +702,38 @@ Type 'help' or '?' for available commands.
                 
             # Execute the command
             try:
-                # Handle echo commands
-                if line.lower().startswith('echo '):
-                    print(line[5:])
-                # Handle other commands by calling the appropriate method
+                # Split off the command name and look it up like onecmd does
+                parts = line.split(None, 1)
+                cmd = parts[0].lower()
+                args = parts[1] if len(parts) > 1 else ''
+                
+                func = self._cmd_table.get(cmd)
+                if func is not None:
+                    # do_* methods print their own output
+                    func(self, args)
                 else:
-                    # Parse command and arguments
-                    parts = line.split()
-                    if not parts:
-                        continue
-                        
-                    cmd = parts[0].lower()
-                    args = ' '.join(parts[1:]) if len(parts) > 1 else ''
-                    
-                    # Execute built-in commands
-                    if hasattr(self, f"do_{cmd}"):
-                        method = getattr(self, f"do_{cmd}")
-                        # Capture output and print it
-                        import io
-                        import contextlib
-                        f = io.StringIO()
-                        with contextlib.redirect_stdout(f):
-                            method(args)
-                        output = f.getvalue()
-                        if output.strip():
-                            print(output.strip())
-                    # Handle some special cases
-                    elif cmd == 'cd':
-                        result = self._change_directory(args)
-                        if result:
-                            print(result)
-                    elif cmd == 'dir':
-                        import io
-                        import contextlib
-                        f = io.StringIO()
-                        with contextlib.redirect_stdout(f):
-                            self._list_files()
-                        output = f.getvalue()
-                        print(output.strip())
-                    elif cmd == 'mount':
-                        import io
-                        import contextlib
-                        f = io.StringIO()
-                        with contextlib.redirect_stdout(f):
-                            self._mount_command()
-                        output = f.getvalue()
-                        print(output.strip())
-                    elif cmd == 'date':
-                        print(str(datetime.now()))
-                    else:
-                        print(f"Startup command not recognized: {line}")
+                    print(f"Startup command not recognized: {line}")
             except Exception as e:
                 print(f"Error executing startup command '{line}': {e}")
     
     def precmd(self, line):
         """Process command line before execution - handle device names as CD commands"""
+        # Directory listings get revalidated while the next line is completed
+        self._listdir_checked.clear()
+        
         # If the line is just a device name (ends with :), treat it as a CD command
-        if line and line.upper().endswith(':') and ':' in line:
+        if line.endswith(':'):
             # Check if it's a valid device (case insensitive)
             device = line.upper()
             
-            # Handle logical assignments (common Amiga directory shortcuts)
-            logical_assignments = {
-                "S:": "SYS:S",
-                "L:": "SYS:L", 
-                "DEVS:": "SYS:DEVS",
-                "FONTS:": "SYS:Fonts",
-                "T:": "RAM:T"
-            }
-            
-            if device in logical_assignments:
-                return f"cd {logical_assignments[device]}"
-            
-            # Check main devices
-            if device in [d.upper() for d in self.directories.keys()]:
-                # Find the actual device name with correct case
-                for actual_device in self.directories.keys():
-                    if actual_device.upper() == device:
-                        return f"cd {actual_device}"
+            assigned_dir = LOGICAL_ASSIGNMENTS.get(device)
+            if assigned_dir is not None:
+                return f"cd {assigned_dir}"
+            
+            # Check main devices, mapping back to the actual name's case
+            actual_device = self._devices_upper.get(device)
+            if actual_device is not None:
+                return f"cd {actual_device}"
         return line
         
     def complete_cd(self, text, line, begidx, endidx):
@@ -558,6 +744,99 @@ Type 'help' or '?' for available commands.
         """Autocomplete for DIR command - complete directory and file names"""
         return self._get_matching_paths(text, directories_only=False)
         
+    def _index_file(self, file_path):
+        """Record a virtual file under its parent prefix ("C:" or "SYS:S/")"""
+        cut = file_path.rfind("/") + 1 or file_path.find(":") + 1
+        bisect.insort(self._files_by_dir.setdefault(file_path[:cut], []), file_path[cut:])
+    
+    def _store_file(self, file_path, content):
+        """Write a file to the virtual file system"""
+        if file_path not in self.files:
+            self._index_file(file_path)
+        self.files[file_path] = content
+    
+    def _remove_file(self, file_path):
+        """Delete a file from the virtual file system"""
+        del self.files[file_path]
+        cut = file_path.rfind("/") + 1 or file_path.find(":") + 1
+        names = self._files_by_dir[file_path[:cut]]
+        del names[bisect.bisect_left(names, file_path[cut:])]
+    
+    def _sorted_subdirs(self, path):
+        """Return the subdirectory names of a virtual directory in sorted order"""
+        subdirs = self._subdirs_sorted.get(path)
+        if subdirs is None:
+            subdirs = self._subdirs_sorted[path] = sorted(self.directories.get(path, ()))
+        return subdirs
+    
+    @staticmethod
+    def _scan_real_dir(fs_path):
+        """Split a real directory into directory and file entries, sorted case-insensitively"""
+        dirs = []
+        files = []
+        with os.scandir(fs_path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    # If we can't access the item, treat it as a file
+                    is_dir = False
+                if is_dir:
+                    dirs.append(entry)
+                else:
+                    files.append(entry)
+        dirs.sort(key=lambda entry: entry.name.lower())
+        files.sort(key=lambda entry: entry.name.lower())
+        return dirs, files
+    
+    @staticmethod
+    def _real_size_mtime(entry):
+        """Size and modification time of a scanned DirEntry, from its cached stat"""
+        try:
+            st = entry.stat()
+        except OSError:
+            return 0, None
+        return st.st_size, st.st_mtime
+    
+    @staticmethod
+    def _real_mtime(path_or_entry):
+        """Modification time of a real path or scanned DirEntry, or None if it can't be read"""
+        try:
+            if isinstance(path_or_entry, os.DirEntry):
+                # DirEntry caches its stat result (and on Windows gets it from the scan)
+                return path_or_entry.stat().st_mtime
+            return os.stat(path_or_entry).st_mtime
+        except OSError:
+            return None
+    
+    def _cached_listdir(self, path):
+        """Return (name, is_dir) pairs for a real directory, reused until its mtime changes"""
+        # Already checked while completing the current line
+        if path in self._listdir_checked:
+            return self._listdir_cache[path][1]
+        
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        
+        cached = self._listdir_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            self._listdir_checked.add(path)
+            return cached[1]
+        
+        with os.scandir(path) as it:
+            entries = [(entry.name, entry.is_dir()) for entry in it]
+        
+        if path not in self._listdir_cache and len(self._listdir_cache) >= LISTDIR_CACHE_SIZE:
+            # Drop the oldest listing
+            oldest = next(iter(self._listdir_cache))
+            del self._listdir_cache[oldest]
+            self._listdir_checked.discard(oldest)
+        self._listdir_cache[path] = (mtime, entries)
+        self._listdir_checked.add(path)
+        return entries
+    
     def _get_matching_paths(self, text, directories_only=False):
         """Get matching paths for autocomplete"""
         # Handle absolute paths (starting with device:)
@@ -567,28 +846,10 @@ Type 'help' or '?' for available commands.
             
             # Handle DH0: with actual file system
             if device.upper() == "DH0:":
-                # Check if we're running in WSL environment
-                is_wsl = os.path.exists("/mnt/c")
-                is_windows = platform.system() == "Windows"
-                
-                if is_wsl or is_windows:
+                if DH0_IS_REAL:
                     try:
                         # Determine the actual file system path
-                        if is_wsl:
-                            fs_base_path = "/mnt/c"
-                        else:
-                            fs_base_path = "C:\\"
-                            
-                        if path_part:
-                            if is_wsl:
-                                fs_search_path = os.path.join(fs_base_path, path_part.replace("\\", "/"))
-                            else:
-                                fs_search_path = os.path.join(fs_base_path, path_part.replace("/", "\\"))
-                        else:
-                            fs_search_path = fs_base_path
-                        
-                        # Normalize the path
-                        fs_search_path = os.path.normpath(fs_search_path)
+                        fs_search_path = dh0_to_fs_path("DH0:" + path_part)
                         
                         # Get parent directory to list contents
                         if path_part and not path_part.endswith("/") and not path_part.endswith("\\"):
@@ -596,49 +857,41 @@ Type 'help' or '?' for available commands.
                         else:
                             fs_parent_path = fs_search_path
                         
-                        if os.path.exists(fs_parent_path) and os.path.isdir(fs_parent_path):
-                            items = os.listdir(fs_parent_path)
+                        entries = self._cached_listdir(fs_parent_path)
+                        if entries is not None:
+                            # Split the text into the directory typed so far and the name being completed
+                            cut = path_part.rfind("/") + 1
+                            base = device + path_part[:cut]
+                            name_prefix = path_part[cut:]
                             matches = []
-                            for item in items:
-                                item_path = os.path.join(fs_parent_path, item)
-                                if path_part:
-                                    full_path = device + path_part.rsplit("/", 1)[0] + "/" + item
-                                else:
-                                    full_path = device + item
+                            for item, is_dir in entries:
+                                if name_prefix and not item.startswith(name_prefix):
+                                    continue
                                 
                                 # Add trailing slash for directories
-                                if os.path.isdir(item_path):
-                                    full_path += "/"
-                                    if directories_only:
-                                        matches.append(full_path)
-                                    else:
-                                        matches.append(full_path)
+                                if is_dir:
+                                    matches.append(base + item + "/")
                                 elif not directories_only:
-                                    matches.append(full_path)
-                            
-                            # Filter by text match
-                            return [match for match in matches if match.startswith(text)]
+                                    matches.append(base + item)
+                            return matches
                     except Exception:
                         pass  # Fall back to placeholder matching
             
             # Handle other devices with placeholder content
             if device in self.directories:
-                matches = []
                 # Add directories
-                for dir_name in self.directories[device]:
-                    full_path = device + dir_name + "/"
-                    if full_path.startswith(text):
-                        matches.append(full_path)
+                subdirs = self._sorted_subdirs(device)
+                lo, hi = prefix_range(subdirs, path_part)
+                matches = [device + dir_name + "/" for dir_name in subdirs[lo:hi]]
+                if path_part.endswith("/") and path_part[:-1] in self.directories[device]:
+                    # A fully typed directory name still completes to itself
+                    matches.append(device + path_part)
                 
                 # Add files if not directory only
                 if not directories_only:
-                    for file_path in self.files:
-                        if file_path.startswith(device):
-                            file_name = file_path[len(device):]
-                            if "/" not in file_name:  # Only direct children
-                                full_path = device + file_name
-                                if full_path.startswith(text):
-                                    matches.append(full_path)
+                    names = self._files_by_dir.get(device, [])
+                    lo, hi = prefix_range(names, path_part)
+                    matches.extend(device + file_name for file_name in names[lo:hi])
                 
                 return matches
         
@@ -649,37 +902,16 @@ Type 'help' or '?' for available commands.
             
             # Handle DH0: with actual file system
             if self.current_dir.upper().startswith("DH0:"):
-                # Check if we're running in WSL environment
-                is_wsl = os.path.exists("/mnt/c")
-                is_windows = platform.system() == "Windows"
-                
-                if is_wsl or is_windows:
+                if DH0_IS_REAL:
                     try:
                         # Determine current directory path
-                        if self.current_dir.upper() == "DH0:":
-                            if is_wsl:
-                                fs_path = "/mnt/c"
-                            else:
-                                fs_path = "C:\\"
-                        else:
-                            sub_path = self.current_dir[4:]  # Remove "DH0:" prefix
-                            if sub_path.startswith("/"):
-                                sub_path = sub_path[1:]
-                            
-                            if is_wsl:
-                                fs_path = os.path.join("/mnt/c", sub_path.replace("\\", "/"))
-                            else:
-                                fs_path = os.path.join("C:\\", sub_path.replace("/", "\\"))
-                        
-                        # Normalize the path
-                        fs_path = os.path.normpath(fs_path)
+                        fs_path = dh0_to_fs_path(self.current_dir)
                         
-                        if os.path.exists(fs_path) and os.path.isdir(fs_path):
-                            items = os.listdir(fs_path)
-                            for item in items:
-                                item_path = os.path.join(fs_path, item)
-                                if item.startswith(text):
-                                    if os.path.isdir(item_path):
+                        entries = self._cached_listdir(fs_path)
+                        if entries is not None:
+                            for item, is_dir in entries:
+                                if not text or item.startswith(text):
+                                    if is_dir:
                                         matches.append(item + "/")
                                     elif not directories_only:
                                         matches.append(item)
@@ -689,18 +921,15 @@ Type 'help' or '?' for available commands.
             
             # Handle other devices with placeholder content
             # Add directories in current directory
-            if self.current_dir in self.directories:
-                for dir_name in self.directories[self.current_dir]:
-                    if dir_name.startswith(text):
-                        matches.append(dir_name + "/")
+            subdirs = self._sorted_subdirs(self.current_dir)
+            lo, hi = prefix_range(subdirs, text)
+            matches.extend(dir_name + "/" for dir_name in subdirs[lo:hi])
             
             # Add files in current directory if not directory only
             if not directories_only:
-                for file_path in self.files:
-                    if file_path.startswith(self.current_dir + "/"):
-                        file_name = file_path[len(self.current_dir) + 1:]
-                        if "/" not in file_name and file_name.startswith(text):  # Only direct children
-                            matches.append(file_name)
+                names = self._files_by_dir.get(self.current_dir + "/", [])
+                lo, hi = prefix_range(names, text)
+                matches.extend(names[lo:hi])
             
             return matches
         
@@ -765,12 +994,16 @@ Type 'help' or '?' for available commands.
             print(self._mount_command())
             return
         
+        # Upper-case the keyword positions once for all the checks below
+        verb = args[0].upper()
+        subverb = args[1].upper() if len(args) > 1 else ""
+        
         # Handle LIST commands
-        if args[0].upper() == "LIST":
-            if len(args) > 1 and args[1].upper() == "WINUAE":
+        if verb == "LIST":
+            if subverb == "WINUAE":
                 self._list_winuae_configs()
                 return
-            elif len(args) > 1 and args[1].upper() == "FS-UAE":
+            elif subverb == "FS-UAE":
                 self._list_fsuae_configs()
                 return
             else:
@@ -778,62 +1011,49 @@ Type 'help' or '?' for available commands.
                 return
         
         # Handle UNMOUNT commands
-        if args[0].upper() == "UNMOUNT":
+        if verb == "UNMOUNT":
             if len(args) > 1:
-                device = args[1]
+                device = normalize_device(args[1])
                 success, message = self.emulator_integration.unmount_shared_folder(device)
                 print(message)
                 if success:
                     # Remove from our directories
-                    device = device.upper()
-                    if not device.endswith(':'):
-                        device += ':'
                     if device in self.directories:
                         del self.directories[device]
+                        self._devices_upper.pop(device, None)
+                        self._subdirs_sorted.pop(device, None)
             else:
                 print("Usage: MOUNT UNMOUNT <device>")
             return
         
         # Handle mount commands: DEVICE FROM EMULATOR CONFIG
-        if len(args) >= 4 and args[1].upper() == "FROM":
-            device = args[0]
+        if len(args) >= 4 and subverb == "FROM":
+            device = normalize_device(args[0])
             emulator_type = args[2]
-            config_name = " ".join(args[3:]).strip('"')  # Handle quoted config names
+            # Take the rest of the line verbatim so quoted names keep their spacing
+            config_name = unquote(arg.split(None, 3)[3].rstrip())
             
             success, message = self.emulator_integration.mount_shared_folder(device, emulator_type, config_name)
             print(message)
             
             if success:
-                # Add to our directories for navigation
-                device = device.upper()
-                if not device.endswith(':'):
-                    device += ':'
-                
-                # Get the actual path and populate directory listing
+                # Add to our directories for navigation, listing the actual path
                 shared_path = self.emulator_integration.get_shared_folder_path(device)
-                if shared_path and os.path.exists(shared_path):
+                if shared_path:
                     try:
-                        contents = os.listdir(shared_path)
-                        self.directories[device] = [item for item in contents if os.path.isdir(os.path.join(shared_path, item))]
+                        with os.scandir(shared_path) as it:
+                            self.directories[device] = [entry.name for entry in it if entry.is_dir()]
+                    except FileNotFoundError:
+                        return
                     except Exception as e:
                         print(f"Warning: Could not read shared folder contents: {e}")
                         self.directories[device] = []
+                    self._devices_upper[device] = device
+                    self._subdirs_sorted.pop(device, None)
             return
         
         # If we get here, show usage
-        print("Usage:")
-        print("  MOUNT                                    - Show mounted volumes")
-        print("  MOUNT <device> FROM WINUAE <config>     - Mount WinUAE shared folder")
-        print("  MOUNT <device> FROM FS-UAE <config>     - Mount FS-UAE shared folder")
-        print("  MOUNT LIST WINUAE                       - List WinUAE configurations")
-        print("  MOUNT LIST FS-UAE                       - List FS-UAE configurations")
-        print("  MOUNT UNMOUNT <device>                  - Unmount shared folder")
-        print("")
-        print("Examples:")
-        print("  MOUNT SHARED: FROM WINUAE \"My A1200 Config\"")
-        print("  MOUNT UAE0: FROM FS-UAE \"Workbench31.fs-uae\"")
-        print("  MOUNT LIST WINUAE")
-        print("  MOUNT UNMOUNT SHARED:")
+        print(MOUNT_USAGE)
         
     def do_echo(self, arg):
         """ECHO <text> - Echo text to terminal"""
@@ -862,11 +1082,7 @@ Type 'help' or '?' for available commands.
     def do_ping(self, arg):
         """PING <host> - Network ping utility"""
         if not arg:
-            print("Usage: PING <host> [COUNT=n]")
-            print("Examples:")
-            print("  PING google.com")
-            print("  PING 8.8.8.8 COUNT=5")
-            print("  PING 127.0.0.1 COUNT=1")
+            print(PING_USAGE)
             return
             
         # Parse arguments (simple implementation)
@@ -876,9 +1092,10 @@ Type 'help' or '?' for available commands.
         
         # Check for count parameter (PING host COUNT=n)
         for part in parts[1:]:
-            if part.upper().startswith("COUNT="):
+            key, sep, value = part.partition("=")
+            if sep and key.upper() == "COUNT":
                 try:
-                    count = int(part.split("=")[1])
+                    count = int(value)
                     count = max(1, min(count, 10))  # Limit between 1-10
                 except ValueError:
                     pass
@@ -888,54 +1105,57 @@ Type 'help' or '?' for available commands.
         
         # Perform actual ping
         success_count = 0
+        timeout_count = 0
         total_time = 0
+        # macOS numbers packets from 0, Linux from 1
+        next_seq = 0 if IS_MACOS else 1
         
-        for i in range(count):
-            try:
-                # Use system ping command
-                if platform.system() == "Windows":
-                    # Windows ping syntax
-                    result = subprocess.run(
-                        ["ping", "-n", "1", "-w", "3000", host],
-                        capture_output=True,
-                        text=True,
-                        timeout=5
-                    )
-                else:
-                    # Unix/Linux ping syntax (WSL)
-                    result = subprocess.run(
-                        ["ping", "-c", "1", "-W", "3", host],
-                        capture_output=True,
-                        text=True,
-                        timeout=5
-                    )
-                
-                if result.returncode == 0:
-                    # Parse ping output for time
-                    output = result.stdout
-                    time_ms = self._parse_ping_time(output)
-                    if time_ms:
-                        print(f"Reply from {host}: bytes=32 time={time_ms}ms TTL=64")
-                        success_count += 1
-                        total_time += time_ms
-                    else:
-                        print(f"Reply from {host}: bytes=32 time<1ms TTL=64")
+        # One system ping run sends all packets; replies are printed as they arrive
+        if IS_WINDOWS:
+            # Windows ping syntax
+            ping_args = ["ping", "-n", str(count), "-w", "3000", host]
+        else:
+            # Unix/Linux ping syntax (WSL)
+            ping_args = ["ping", "-c", str(count), "-W", "3", host]
+        
+        try:
+            with subprocess.Popen(ping_args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True) as process:
+                # Overall deadline; packets still missing when it expires count as timeouts
+                deadline = threading.Timer(count * 4, process.kill)
+                deadline.start()
+                try:
+                    for line in process.stdout:
+                        if not self._is_ping_reply(line) or success_count >= count:
+                            continue
+                        # Report packets skipped before this reply in order; Windows has no sequence field
+                        seq_match = PING_SEQ_PATTERN.search(line)
+                        if seq_match:
+                            seq = int(seq_match.group(1))
+                            if seq < next_seq:
+                                continue  # Duplicate reply
+                            missed = min(seq - next_seq, count - success_count - timeout_count - 1)
+                            for _ in range(missed):
+                                print(f"Request timeout for {host}")
+                                timeout_count += 1
+                            next_seq = seq + 1
+                        time_ms = self._parse_ping_time(line)
+                        if time_ms:
+                            print(f"Reply from {host}: bytes=32 time={time_ms}ms TTL=64")
+                            total_time += time_ms
+                        else:
+                            print(f"Reply from {host}: bytes=32 time<1ms TTL=64")
+                            total_time += 1
                         success_count += 1
-                        total_time += 1
-                else:
-                    print(f"Request timeout for {host}")
-                    
-            except subprocess.TimeoutExpired:
-                print(f"Request timeout for {host}")
-            except FileNotFoundError:
-                print(f"Ping command not available on this system")
-                return
-            except Exception as e:
-                print(f"Ping failed: {e}")
-            
-            # Small delay between pings (except for last one)
-            if i < count - 1:
-                time.sleep(1)
+                finally:
+                    deadline.cancel()
+        except FileNotFoundError:
+            print(f"Ping command not available on this system")
+            return
+        except Exception as e:
+            print(f"Ping failed: {e}")
+        
+        for _ in range(count - success_count - timeout_count):
+            print(f"Request timeout for {host}")
         
         # Print summary
         print()
@@ -949,28 +1169,21 @@ Type 'help' or '?' for available commands.
             print(f"Approximate round trip times in milli-seconds:")
             print(f"    Average = {avg_time:.0f}ms")
             
+    def _is_ping_reply(self, ping_output):
+        """Check whether a line of ping output reports a reply"""
+        # A reply carries a round trip time; Windows IPv6 replies have no TTL
+        if PING_TIME_PATTERN.search(ping_output):
+            return True
+        line = ping_output.lower()
+        if ("reply from" in line or "bytes from" in line) and not any(error in line for error in PING_ERROR_REPLIES):
+            return True
+        # Localized output still keeps the TTL field
+        return "ttl=" in line
+        
     def _parse_ping_time(self, ping_output):
         """Parse ping time from ping command output"""
-        import re
-        
-        # Look for time patterns in ping output
-        # Windows: "time<1ms" or "time=123ms"
-        # Linux: "time=123 ms" or "time=123ms"
-        patterns = [
-            r'time[<=](\d+(?:\.\d+)?)ms',
-            r'time[<=](\d+(?:\.\d+)?)\s*ms',
-            r'time[<=](\d+(?:\.\d+)?)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, ping_output, re.IGNORECASE)
-            if match:
-                try:
-                    return float(match.group(1))
-                except ValueError:
-                    continue
-        
-        return None
+        match = PING_TIME_PATTERN.search(ping_output)
+        return float(match.group(1)) if match else None
         
     def do_winuae(self, arg):
         """WINUAE [config] - Launch WinUAE Amiga emulator"""
@@ -981,14 +1194,9 @@ Type 'help' or '?' for available commands.
         # Check if WinUAE executable exists
         winuae_exe = get_winuae_executable()
         if not winuae_exe:
-            print("ERROR: WinUAE executable not found!")
-            print()
-            print("Please install WinUAE or set the WINUAE_PATH environment variable:")
-            print("  set WINUAE_PATH=C:\\Path\\To\\Your\\winuae.exe")
-            print()
-            print("Common installation paths:")
-            print("  C:\\Program Files\\WinUAE\\winuae.exe")
-            print("  C:\\Program Files (x86)\\WinUAE\\winuae.exe")
+            # Probe again next time, in case WinUAE gets installed meanwhile
+            get_winuae_executable.cache_clear()
+            print(WINUAE_NOT_FOUND_HELP)
             return
         
         print(f"WinUAE Executable: {winuae_exe}")
@@ -1008,10 +1216,7 @@ Type 'help' or '?' for available commands.
             else:
                 print("\nNo configuration files found in:")
                 print(f"  {WINUAE_CONFIG['config_dir']}")
-            print()
-            print("Usage: WINUAE [config_name]")
-            print("       WINUAE LIST")
-            print("       WINUAE CONFIG")
+            print(WINUAE_USAGE)
             return
         elif arg.upper() == "CONFIG":
             # Show configuration information
@@ -1042,7 +1247,7 @@ Type 'help' or '?' for available commands.
         print(f"Configuration: {config_path}")
         
         # Check if configuration file exists
-        if not os.path.exists(config_path):
+        if not winuae_config_exists(config_path):
             print(f"ERROR: Configuration file not found!")
             print()
             available_configs = list_winuae_configs()
@@ -1071,7 +1276,7 @@ Type 'help' or '?' for available commands.
                 cmd_args,
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
-                creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if platform.system() == "Windows" else 0
+                creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if IS_WINDOWS else 0
             )
             
             print(f"WinUAE launched with PID {process.pid}")
@@ -1088,12 +1293,7 @@ Type 'help' or '?' for available commands.
     def do_say(self, arg):
         """SAY <text> [RATE=n] [VOICE=name] - Text-to-speech synthesis"""
         if not arg:
-            print("Usage: SAY <text> [RATE=n] [VOICE=name]")
-            print("Examples:")
-            print("  SAY \"Hello from Amiga\"")
-            print("  SAY \"Welcome to WSA Terminal\" RATE=150")
-            print("  SAY \"Greetings\" VOICE=female")
-            print("  SAY VOICES  (list available voices)")
+            print(SAY_USAGE)
             return
         
         # Check if user wants to list voices
@@ -1109,14 +1309,17 @@ Type 'help' or '?' for available commands.
         # Split arguments and extract RATE and VOICE parameters
         parts = arg.split()
         for part in parts:
-            if part.upper().startswith("RATE="):
+            # Only KEY=value tokens need their key upper-cased
+            key, sep, value = part.partition("=")
+            key = key.upper() if sep else ""
+            if key == "RATE":
                 try:
-                    rate = int(part.split("=")[1])
+                    rate = int(value)
                     rate = max(50, min(rate, 400))  # Limit between 50-400 WPM
                 except ValueError:
                     print("SAY: Invalid rate value, using default")
-            elif part.upper().startswith("VOICE="):
-                voice = part.split("=")[1].lower()
+            elif key == "VOICE":
+                voice = value.lower()
             else:
                 text_parts.append(part)
         
@@ -1124,10 +1327,7 @@ Type 'help' or '?' for available commands.
         text_to_speak = " ".join(text_parts)
         
         # Remove quotes if present
-        if text_to_speak.startswith('"') and text_to_speak.endswith('"'):
-            text_to_speak = text_to_speak[1:-1]
-        elif text_to_speak.startswith("'") and text_to_speak.endswith("'"):
-            text_to_speak = text_to_speak[1:-1]
+        text_to_speak = unquote(text_to_speak)
         
         if not text_to_speak:
             print("SAY: No text specified")
@@ -1135,33 +1335,41 @@ Type 'help' or '?' for available commands.
         
         print(f"Speaking: \"{text_to_speak}\"")
         
-        # Try different TTS engines based on platform
-        success = False
-        
-        # Try Windows SAPI (Speech API)
-        if platform.system() == "Windows":
-            success = self._say_windows_sapi(text_to_speak, rate, voice)
-        
-        # Try espeak (cross-platform, common on Linux/WSL)
-        if not success:
-            success = self._say_espeak(text_to_speak, rate, voice)
-        
-        # Try festival (another Linux TTS engine)
-        if not success:
-            success = self._say_festival(text_to_speak, rate, voice)
-        
-        # Try say command (macOS)
-        if not success and platform.system() == "Darwin":
-            success = self._say_macos(text_to_speak, rate, voice)
-        
-        # Try pyttsx3 (Python TTS library)
-        if not success:
-            success = self._say_pyttsx3(text_to_speak, rate, voice)
-        
-        if not success:
+        # Try the available TTS engines in order of preference
+        for speak in self._get_tts_backends():
+            if speak(text_to_speak, rate, voice):
+                break
+        else:
             print("SAY: Text-to-speech not available on this system")
             print("Try installing: espeak, festival, or pyttsx3")
     
+    def _get_tts_backends(self):
+        """Get the TTS engines usable on this system, in order of preference"""
+        if self._tts_backends is None:
+            backends = []
+            
+            # Windows SAPI (Speech API)
+            if IS_WINDOWS:
+                backends.append(self._say_windows_sapi)
+            
+            # espeak (cross-platform, common on Linux/WSL)
+            if shutil.which("espeak"):
+                backends.append(self._say_espeak)
+            
+            # festival (another Linux TTS engine)
+            if shutil.which("festival"):
+                backends.append(self._say_festival)
+            
+            # say command (macOS)
+            if IS_MACOS and shutil.which("say"):
+                backends.append(self._say_macos)
+            
+            # pyttsx3 (Python TTS library), which remembers its own availability
+            backends.append(self._say_pyttsx3)
+            
+            self._tts_backends = backends
+        return self._tts_backends
+    
     def _list_tts_voices(self):
         """List available TTS voices"""
         print("Available Text-to-Speech Voices:")
@@ -1170,7 +1378,7 @@ Type 'help' or '?' for available commands.
         voices_found = False
         
         # Try to list Windows SAPI voices
-        if platform.system() == "Windows":
+        if IS_WINDOWS:
             try:
                 result = subprocess.run(
                     ["powershell", "-Command", 
@@ -1189,31 +1397,37 @@ Type 'help' or '?' for available commands.
             except Exception:
                 pass
         
+        # Only ask the engines that were found on the PATH
+        backends = self._get_tts_backends()
+        
         # Try to list espeak voices
-        try:
-            result = subprocess.run(["espeak", "--voices"], capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                print("eSpeak Voices:")
-                lines = result.stdout.strip().split('\n')
-                for line in lines[1:6]:  # Show first 5 voices
-                    if line.strip():
-                        parts = line.split()
-                        if len(parts) >= 4:
-                            print(f"  {parts[3]} ({parts[1]})")
-                voices_found = True
-                print()
-        except Exception:
-            pass
+        if self._say_espeak in backends:
+            try:
+                result = subprocess.run(["espeak", "--voices"], capture_output=True, text=True, timeout=5)
+                if result.returncode == 0:
+                    print("eSpeak Voices:")
+                    lines = result.stdout.strip().split('\n')
+                    for line in lines[1:6]:  # Show first 5 voices
+                        if line.strip():
+                            parts = line.split()
+                            if len(parts) >= 4:
+                                print(f"  {parts[3]} ({parts[1]})")
+                    voices_found = True
+                    print()
+            except Exception:
+                pass
         
         # Try to list festival voices
-        try:
-            result = subprocess.run(["festival", "--help"], capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                print("Festival: Available (use default voice)")
-                voices_found = True
-                print()
-        except Exception:
-            pass
+        if self._say_festival in backends:
+            try:
+                result = subprocess.run(["festival", "--help"], stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.DEVNULL, timeout=5)
+                if result.returncode == 0:
+                    print("Festival: Available (use default voice)")
+                    voices_found = True
+                    print()
+            except Exception:
+                pass
         
         if not voices_found:
             print("No TTS engines detected.")
@@ -1222,28 +1436,61 @@ Type 'help' or '?' for available commands.
             print("  Linux/WSL: sudo apt install espeak espeak-data")
             print("  Python: pip install pyttsx3")
     
+    def _get_sapi_voice(self):
+        """Get the shared SAPI.SpVoice COM object, or None if unavailable"""
+        if self._sapi_voice is None:
+            try:
+                import comtypes.client
+                self._sapi_voice = comtypes.client.CreateObject("SAPI.SpVoice")
+                self._sapi_default_voice = self._sapi_voice.Voice
+            except Exception:
+                self._sapi_voice = False
+        return self._sapi_voice or None
+    
     def _say_windows_sapi(self, text, rate=None, voice=None):
         """Use Windows SAPI for text-to-speech"""
+        sapi = self._get_sapi_voice()
+        if sapi:
+            try:
+                # Settings persist on the shared voice, so reset them each time
+                sapi.Rate = max(-10, min(10, (rate - 200) // 20)) if rate else 0
+                sapi.Voice = self._sapi_default_voice
+                if voice:
+                    tokens = sapi.GetVoices()
+                    for i in range(tokens.Count):
+                        token = tokens.Item(i)
+                        if voice in token.GetDescription().lower():
+                            sapi.Voice = token
+                            break
+                
+                sapi.Speak(text, 0)
+                return True
+            except Exception:
+                pass
+        
+        # Fall back to a one-off PowerShell System.Speech run
         try:
-            # Build PowerShell command for Windows Speech API
-            ps_cmd = [
-                "powershell", "-Command",
-                "Add-Type -AssemblyName System.Speech; " +
+            # Build PowerShell script for Windows Speech API
+            script = [
+                "Add-Type -AssemblyName System.Speech; ",
                 "$synth = New-Object System.Speech.Synthesis.SpeechSynthesizer; "
             ]
             
             # Set rate if specified
             if rate:
-                ps_cmd[2] += f"$synth.Rate = {max(-10, min(10, (rate - 200) // 20))}; "
+                script.append(f"$synth.Rate = {max(-10, min(10, (rate - 200) // 20))}; ")
             
             # Set voice if specified
             if voice:
-                ps_cmd[2] += f"try {{ $synth.SelectVoice((Get-WmiObject Win32_CDROMDrive | Where-Object {{$_.Caption -like '*{voice}*'}})); }} catch {{ }}; "
+                script.append("try { $v = $synth.GetInstalledVoices() | "
+                              f"Where-Object {{ $_.VoiceInfo.Name -like {ps_quote('*' + voice + '*')} }} | "
+                              "Select-Object -First 1; if ($v) { $synth.SelectVoice($v.VoiceInfo.Name) } } catch { }; ")
             
             # Speak the text
-            ps_cmd[2] += f"$synth.Speak('{text.replace(chr(39), chr(39)+chr(39))}'); $synth.Dispose()"
+            script.append(f"$synth.Speak({ps_quote(text)}); $synth.Dispose()")
             
-            result = subprocess.run(ps_cmd, capture_output=True, text=True, timeout=30)
+            ps_cmd = ["powershell", "-Command", "".join(script)]
+            result = subprocess.run(ps_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30)
             return result.returncode == 0
         except Exception:
             return False
@@ -1276,7 +1523,7 @@ Type 'help' or '?' for available commands.
             # Add the text
             cmd.append(text)
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30)
             return result.returncode == 0
         except Exception:
             return False
@@ -1286,9 +1533,9 @@ Type 'help' or '?' for available commands.
         try:
             # Festival uses a different approach - pipe text to it
             cmd = ["festival", "--tts"]
-            process = subprocess.Popen(cmd, stdin=subprocess.PIPE, text=True, timeout=30)
-            process.communicate(input=text)
-            return process.returncode == 0
+            result = subprocess.run(cmd, input=text, text=True, stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.DEVNULL, timeout=30)
+            return result.returncode == 0
         except Exception:
             return False
     
@@ -1305,22 +1552,37 @@ Type 'help' or '?' for available commands.
             
             cmd.append(text)
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30)
             return result.returncode == 0
         except Exception:
             return False
     
+    def _get_pyttsx3_engine(self):
+        """Get the shared pyttsx3 engine, or None if unavailable"""
+        if self._pyttsx3_engine is None:
+            try:
+                import pyttsx3
+                engine = pyttsx3.init()
+                self._pyttsx3_defaults = (engine.getProperty('rate'), engine.getProperty('voice'),
+                                          engine.getProperty('voices'))
+                self._pyttsx3_engine = engine
+            except Exception:
+                self._pyttsx3_engine = False
+        return self._pyttsx3_engine or None
+    
     def _say_pyttsx3(self, text, rate=None, voice=None):
         """Use pyttsx3 Python library for text-to-speech"""
+        engine = self._get_pyttsx3_engine()
+        if not engine:
+            return False
+        
         try:
-            import pyttsx3
-            engine = pyttsx3.init()
-            
-            if rate:
-                engine.setProperty('rate', rate)
+            # Settings persist on the shared engine, so reset them each time
+            default_rate, default_voice, voices = self._pyttsx3_defaults
+            engine.setProperty('rate', rate or default_rate)
+            engine.setProperty('voice', default_voice)
             
             if voice:
-                voices = engine.getProperty('voices')
                 for v in voices:
                     if voice.lower() in v.name.lower():
                         engine.setProperty('voice', v.id)
@@ -1328,10 +1590,7 @@ Type 'help' or '?' for available commands.
             
             engine.say(text)
             engine.runAndWait()
-            engine.stop()
             return True
-        except ImportError:
-            return False
         except Exception:
             return False
         
@@ -1373,7 +1632,7 @@ Examples:
         content = []
         if file_path in self.files:
             content = self.files[file_path].split('\n')
-        elif file_path.startswith("DH0:") and platform.system() == "Windows":
+        elif file_path.startswith("DH0:") and IS_WINDOWS:
             # Try to read from actual file system
             try:
                 fs_path = self._get_fs_path(file_path)
@@ -1397,59 +1656,57 @@ Examples:
         file_path = self._resolve_file_path(arg)
         
         # Try to find the file in virtual file system first
-        if file_path in self.files:
-            content = self.files[file_path]
+        content = self.files.get(file_path)
+        if content is not None:
             print(content)
             return
             
         # Try to find the file in actual file system (for DH0:)
-        if file_path.startswith("DH0:"):
-            # Check if we're running in WSL environment
-            is_wsl = os.path.exists("/mnt/c")
-            is_windows = platform.system() == "Windows"
-            
-            if is_wsl or is_windows:
-                try:
-                    sub_path = file_path[4:]  # Remove "DH0:" prefix
-                    if sub_path.startswith("/"):
-                        sub_path = sub_path[1:]
-                    
-                    if is_wsl:
-                        fs_path = os.path.join("/mnt/c", sub_path.replace("\\", "/"))
-                    else:
-                        fs_path = os.path.join("C:\\", sub_path.replace("/", "\\"))
-                    
-                    # Normalize the path
-                    fs_path = os.path.normpath(fs_path)
-                    
-                    if os.path.exists(fs_path) and os.path.isfile(fs_path):
-                        try:
-                            with open(fs_path, 'r', encoding='utf-8') as f:
-                                content = f.read()
-                            print(content)
-                            return
-                        except UnicodeDecodeError:
-                            # Try with different encoding for binary files
-                            try:
-                                with open(fs_path, 'r', encoding='latin-1') as f:
-                                    content = f.read()
-                                print(content)
-                                return
-                            except Exception:
-                                print(f"TYPE: Cannot read file '{arg}' - binary file or encoding error")
-                                return
-                        except Exception as e:
-                            print(f"TYPE: Error reading file '{arg}': {e}")
-                            return
-                    else:
-                        print(f"TYPE: File '{arg}' not found")
+        if file_path.startswith("DH0:") and DH0_IS_REAL:
+            try:
+                fs_path = dh0_to_fs_path(file_path)
+                
+                if os.path.isfile(fs_path):
+                    try:
+                        self._stream_real_file(fs_path)
                         return
-                except Exception as e:
-                    print(f"TYPE: Error accessing file '{arg}': {e}")
+                    except Exception as e:
+                        print(f"TYPE: Error reading file '{arg}': {e}")
+                        return
+                else:
+                    print(f"TYPE: File '{arg}' not found")
                     return
-                    
+            except Exception as e:
+                print(f"TYPE: Error accessing file '{arg}': {e}")
+                return
+                
         print(f"TYPE: File '{arg}' not found")
         
+    @staticmethod
+    def _stream_real_file(fs_path):
+        """Copy a real file's bytes to the terminal in chunks, without decoding it"""
+        out = getattr(sys.stdout, "buffer", None)
+        with open(fs_path, 'rb') as f:
+            if out is None:
+                # stdout has been replaced by a text-only stream
+                print(f.read().decode('utf-8', errors='replace'))
+                return
+            
+            # Anything printed so far must come out before the raw bytes
+            sys.stdout.flush()
+            last = b"\n"
+            while True:
+                chunk = f.read(TYPE_CHUNK_SIZE)
+                if not chunk:
+                    break
+                out.write(chunk)
+                last = chunk[-1:]
+            
+            # End on a fresh line so the prompt is not glued to the text
+            if last != b"\n":
+                out.write(b"\n")
+            out.flush()
+        
     def do_copy(self, arg):
         """COPY <source> <dest> - Copy files"""
         if not arg:
@@ -1476,6 +1733,16 @@ Examples:
         # Try virtual file system first
         if source_path in self.files:
             source_content = self.files[source_path]
+        # Copy real DH0: files directly, without reading them into memory
+        elif source_path.startswith("DH0:") and dest_path.startswith("DH0:"):
+            copied = self._copy_real_file(source_path, dest_path)
+            if copied is None:
+                print(f"COPY: Cannot read source file '{source_file}'")
+            elif copied:
+                print(f"COPY: '{source_file}' copied to '{dest_file}'")
+            else:
+                print(f"COPY: Failed to copy to '{dest_file}'")
+            return
         # Try real file system for DH0:
         elif source_path.startswith("DH0:"):
             source_content = self._read_real_file(source_path)
@@ -1495,7 +1762,7 @@ Examples:
                 print(f"COPY: Failed to copy to '{dest_file}'")
         else:
             # Write to virtual file system
-            self.files[dest_path] = source_content
+            self._store_file(dest_path, source_content)
             print(f"COPY: '{source_file}' copied to '{dest_file}'")
             
     def do_delete(self, arg):
@@ -1542,7 +1809,7 @@ Examples:
             else:
                 print(f"DELETE: Failed to delete '{arg}'")
         else:
-            del self.files[file_path]
+            self._remove_file(file_path)
             print(f"DELETE: File '{arg}' deleted")
 
     def do_makedir(self, arg):
@@ -1577,6 +1844,7 @@ Examples:
             if dir_path not in self.directories:
                 # Add the new directory as a new key with empty subdirectories list
                 self.directories[dir_path] = []
+                self._devices_upper[dir_path.upper()] = dir_path
                 print(f"MAKEDIR: Directory '{dir_name}' created")
                 
                 # Also add it to the parent directory's subdirectory list
@@ -1584,6 +1852,7 @@ Examples:
                 if parent_dir in self.directories:
                     if dir_name not in self.directories[parent_dir]:
                         self.directories[parent_dir].append(dir_name)
+                        self._subdirs_sorted.pop(parent_dir, None)
             else:
                 print(f"MAKEDIR: Directory '{dir_name}' already exists")
 
@@ -1592,31 +1861,12 @@ Examples:
         if not amiga_path.startswith("DH0:"):
             return False
             
-        # Check if we're running in WSL environment
-        is_wsl = os.path.exists("/mnt/c")
-        is_windows = platform.system() == "Windows"
-        
-        if not (is_wsl or is_windows):
+        if not DH0_IS_REAL:
             return False
             
         try:
-            sub_path = amiga_path[4:]  # Remove "DH0:" prefix
-            if sub_path.startswith("/"):
-                sub_path = sub_path[1:]
+            fs_path = dh0_to_fs_path(amiga_path)
             
-            if is_wsl:
-                # WSL environment - use /mnt/c
-                fs_path = f"/mnt/c/{sub_path}"
-            else:
-                # Windows environment - use C:\
-                fs_path = f"C:\\{sub_path}"
-                
-            # Convert forward slashes to appropriate path separators
-            if is_wsl:
-                fs_path = fs_path.replace("\\", "/")
-            else:
-                fs_path = fs_path.replace("/", "\\")
-                
             # Create the directory
             os.makedirs(fs_path, exist_ok=True)
             return True
@@ -1630,36 +1880,25 @@ Examples:
         if not amiga_path.startswith("DH0:"):
             return None
             
-        # Check if we're running in WSL environment
-        is_wsl = os.path.exists("/mnt/c")
-        is_windows = platform.system() == "Windows"
-        
-        if not (is_wsl or is_windows):
+        if not DH0_IS_REAL:
             return None
             
         try:
-            sub_path = amiga_path[4:]  # Remove "DH0:" prefix
-            if sub_path.startswith("/"):
-                sub_path = sub_path[1:]
-            
-            if is_wsl:
-                fs_path = os.path.join("/mnt/c", sub_path.replace("\\", "/"))
-            else:
-                fs_path = os.path.join("C:\\", sub_path.replace("/", "\\"))
+            fs_path = dh0_to_fs_path(amiga_path)
             
-            # Normalize the path
-            fs_path = os.path.normpath(fs_path)
-            
-            if os.path.exists(fs_path) and os.path.isfile(fs_path):
-                with open(fs_path, 'r', encoding='utf-8') as f:
-                    return f.read()
+            if os.path.isfile(fs_path):
+                # Read the bytes once and decode them in memory, rather
+                # than reading the file again for the fallback encoding
+                with open(fs_path, 'rb') as f:
+                    data = f.read()
+                try:
+                    text = data.decode('utf-8')
+                except UnicodeDecodeError:
+                    text = data.decode('latin-1')
+                # Match the newline translation of a text-mode read
+                return text.replace('\r\n', '\n').replace('\r', '\n')
         except Exception:
-            try:
-                # Try with different encoding
-                with open(fs_path, 'r', encoding='latin-1') as f:
-                    return f.read()
-            except Exception:
-                pass
+            pass
         return None
         
     def _write_real_file(self, amiga_path, content):
@@ -1667,25 +1906,11 @@ Examples:
         if not amiga_path.startswith("DH0:"):
             return False
             
-        # Check if we're running in WSL environment
-        is_wsl = os.path.exists("/mnt/c")
-        is_windows = platform.system() == "Windows"
-        
-        if not (is_wsl or is_windows):
+        if not DH0_IS_REAL:
             return False
             
         try:
-            sub_path = amiga_path[4:]  # Remove "DH0:" prefix
-            if sub_path.startswith("/"):
-                sub_path = sub_path[1:]
-            
-            if is_wsl:
-                fs_path = os.path.join("/mnt/c", sub_path.replace("\\", "/"))
-            else:
-                fs_path = os.path.join("C:\\", sub_path.replace("/", "\\"))
-            
-            # Normalize the path
-            fs_path = os.path.normpath(fs_path)
+            fs_path = dh0_to_fs_path(amiga_path)
             
             # Create directory if it doesn't exist
             os.makedirs(os.path.dirname(fs_path), exist_ok=True)
@@ -1696,32 +1921,41 @@ Examples:
         except Exception:
             return False
             
+    def _copy_real_file(self, source_amiga_path, dest_amiga_path):
+        """Copy a real file between DH0: paths; None if the source can't be read"""
+        if not DH0_IS_REAL:
+            return None
+            
+        source_fs_path = dh0_to_fs_path(source_amiga_path)
+        dest_fs_path = dh0_to_fs_path(dest_amiga_path)
+        
+        if not os.path.isfile(source_fs_path):
+            return None
+            
+        try:
+            # Create directory if it doesn't exist
+            os.makedirs(os.path.dirname(dest_fs_path), exist_ok=True)
+            
+            # copyfile lets the OS do the copy (sendfile/copy_file_range)
+            shutil.copyfile(source_fs_path, dest_fs_path)
+            return True
+        except shutil.SameFileError:
+            return True
+        except Exception:
+            return False
+            
     def _real_file_exists(self, amiga_path):
         """Check if a real file exists at DH0: path"""
         if not amiga_path.startswith("DH0:"):
             return False
             
-        # Check if we're running in WSL environment
-        is_wsl = os.path.exists("/mnt/c")
-        is_windows = platform.system() == "Windows"
-        
-        if not (is_wsl or is_windows):
+        if not DH0_IS_REAL:
             return False
             
         try:
-            sub_path = amiga_path[4:]  # Remove "DH0:" prefix
-            if sub_path.startswith("/"):
-                sub_path = sub_path[1:]
+            fs_path = dh0_to_fs_path(amiga_path)
             
-            if is_wsl:
-                fs_path = os.path.join("/mnt/c", sub_path.replace("\\", "/"))
-            else:
-                fs_path = os.path.join("C:\\", sub_path.replace("/", "\\"))
-            
-            # Normalize the path
-            fs_path = os.path.normpath(fs_path)
-            
-            return os.path.exists(fs_path) and os.path.isfile(fs_path)
+            return os.path.isfile(fs_path)
         except Exception:
             return False
             
@@ -1730,27 +1964,13 @@ Examples:
         if not amiga_path.startswith("DH0:"):
             return False
             
-        # Check if we're running in WSL environment
-        is_wsl = os.path.exists("/mnt/c")
-        is_windows = platform.system() == "Windows"
-        
-        if not (is_wsl or is_windows):
+        if not DH0_IS_REAL:
             return False
             
         try:
-            sub_path = amiga_path[4:]  # Remove "DH0:" prefix
-            if sub_path.startswith("/"):
-                sub_path = sub_path[1:]
-            
-            if is_wsl:
-                fs_path = os.path.join("/mnt/c", sub_path.replace("\\", "/"))
-            else:
-                fs_path = os.path.join("C:\\", sub_path.replace("/", "\\"))
-            
-            # Normalize the path
-            fs_path = os.path.normpath(fs_path)
+            fs_path = dh0_to_fs_path(amiga_path)
             
-            if os.path.exists(fs_path) and os.path.isfile(fs_path):
+            if os.path.isfile(fs_path):
                 os.remove(fs_path)
                 return True
         except Exception:
@@ -1760,10 +1980,10 @@ Examples:
     def _format_amiga_date(self, timestamp=None, file_path=None, full_format=False):
         """Format date in Amiga style"""
         try:
-            if file_path and os.path.exists(file_path):
+            if file_path:
                 # Get actual file modification time
-                timestamp = os.path.getmtime(file_path)
-            elif timestamp is None:
+                timestamp = self._real_mtime(file_path)
+            if timestamp is None:
                 # Use current time for virtual files
                 timestamp = datetime.now().timestamp()
             
@@ -1798,14 +2018,15 @@ Examples:
         
         fs_path = os.path.normpath(fs_path)
         
-        if not os.path.exists(fs_path) or not os.path.isdir(fs_path):
+        if not os.path.isdir(fs_path):
             print(f"Directory {path} not found.")
             return
         
         try:
-            # Authentic Amiga DIR header
-            day_name = self._format_amiga_day(file_path=fs_path)
-            header_date = self._format_amiga_date(file_path=fs_path)
+            # Authentic Amiga DIR header, from a single stat of the directory
+            header_time = self._real_mtime(fs_path)
+            day_name = self._format_amiga_day(timestamp=header_time)
+            header_date = self._format_amiga_date(timestamp=header_time)
             emulator = shared_info['emulator'].upper()
             config = shared_info['config']
             print(f'Directory "{path}" on {day_name} {header_date}')
@@ -1813,7 +2034,7 @@ Examples:
             
             # List directory contents
             try:
-                items = os.listdir(fs_path)
+                dirs, files = self._scan_real_dir(fs_path)
             except PermissionError:
                 print("Access denied to this directory.")
                 return
@@ -1821,41 +2042,18 @@ Examples:
                 print(f"Error reading directory: {e}")
                 return
             
-            dirs = []
-            files = []
-            
-            # Separate directories and files
-            for item in items:
-                item_path = os.path.join(fs_path, item)
-                try:
-                    if os.path.isdir(item_path):
-                        dirs.append(item)
-                    else:
-                        files.append(item)
-                except:
-                    # If we can't access the item, treat it as a file
-                    files.append(item)
-            
-            # Sort directories and files
-            dirs.sort(key=str.lower)
-            files.sort(key=str.lower)
-            
             # Print directories first (authentic Amiga format)
-            for dir_name in dirs:
-                dir_path = os.path.join(fs_path, dir_name)
-                date_str = self._format_amiga_date(file_path=dir_path, full_format=True)
-                print(f" {dir_name:<22} (dir)    ----rwed     {date_str}")
+            for entry in dirs:
+                date_str = self._format_amiga_date(timestamp=self._real_mtime(entry), full_format=True)
+                print(f" {entry.name:<22} (dir)    ----rwed     {date_str}")
             
             # Print files (authentic Amiga format)  
             total_bytes = 0
-            for file_name in files:
-                file_path = os.path.join(fs_path, file_name)
-                try:
-                    file_size = os.path.getsize(file_path)
-                    total_bytes += file_size
-                except:
-                    file_size = 0
-                date_str = self._format_amiga_date(file_path=file_path, full_format=True)
+            for entry in files:
+                file_name = entry.name
+                file_size, mtime = self._real_size_mtime(entry)
+                total_bytes += file_size
+                date_str = self._format_amiga_date(timestamp=mtime, full_format=True)
                 print(f" {file_name:<22} {file_size:>7}  ----rwed     {date_str}")
             
             dir_count = len(dirs)
@@ -1869,9 +2067,9 @@ Examples:
     def _format_amiga_day(self, timestamp=None, file_path=None):
         """Format day of week in Amiga style"""
         try:
-            if file_path and os.path.exists(file_path):
-                timestamp = os.path.getmtime(file_path)
-            elif timestamp is None:
+            if file_path:
+                timestamp = self._real_mtime(file_path)
+            if timestamp is None:
                 timestamp = datetime.now().timestamp()
             
             dt = datetime.fromtimestamp(timestamp)
@@ -1902,23 +2100,12 @@ Examples:
         
     def _resolve_file_path(self, filename):
         """Resolve filename to full path"""
-        # Handle absolute paths
-        if ":" in filename:
-            return filename
-            
-        # Handle relative paths
-        if self.current_dir.endswith(":"):
-            return f"{self.current_dir}{filename}"
-        else:
-            return f"{self.current_dir}/{filename}"
+        return resolve_file_path(self.current_dir, filename)
             
     def _get_fs_path(self, amiga_path):
         """Convert Amiga path to filesystem path for DH0:"""
         if amiga_path.startswith("DH0:"):
-            sub_path = amiga_path[4:]  # Remove "DH0:" prefix
-            if sub_path.startswith("/"):
-                sub_path = sub_path[1:]
-            return os.path.join("C:\\", sub_path.replace("/", "\\"))
+            return dh0_to_fs_path(amiga_path)
         return None
         
     def _ed_editor(self, file_path, content):
@@ -1944,9 +2131,13 @@ Examples:
             print("Empty file - start typing to add content.")
             print()
         
+        # Keep input() and its line editing for a real terminal, but read
+        # piped or redirected text straight from stdin
+        read_line = input if sys.stdin.isatty() else self._ed_read_piped_line
+        
         while True:
             try:
-                line_input = input(f"{len(lines)+1:3}> ")
+                line_input = read_line(f"{len(lines)+1:3}> ")
                 
                 # Handle editor commands
                 cmd = line_input.upper().strip()
@@ -1959,46 +2150,7 @@ Examples:
                     else:
                         print("File is empty.")
                 elif cmd == "SAVE":
-                    # Save content
-                    content_str = '\n'.join(lines)
-                    
-                    # Check if this is a real file (DH0:) or virtual file
-                    if file_path.startswith("DH0:"):
-                        # Save to actual file system
-                        try:
-                            # Check if we're running in WSL environment
-                            is_wsl = os.path.exists("/mnt/c")
-                            is_windows = platform.system() == "Windows"
-                            
-                            if is_wsl or is_windows:
-                                sub_path = file_path[4:]  # Remove "DH0:" prefix
-                                if sub_path.startswith("/"):
-                                    sub_path = sub_path[1:]
-                                
-                                if is_wsl:
-                                    fs_path = os.path.join("/mnt/c", sub_path.replace("\\", "/"))
-                                else:
-                                    fs_path = os.path.join("C:\\", sub_path.replace("/", "\\"))
-                                
-                                # Normalize the path
-                                fs_path = os.path.normpath(fs_path)
-                                
-                                # Create directory if needed
-                                fs_dir = os.path.dirname(fs_path)
-                                if fs_dir and not os.path.exists(fs_dir):
-                                    os.makedirs(fs_dir)
-                                
-                                with open(fs_path, 'w', encoding='utf-8') as f:
-                                    f.write(content_str)
-                                print(f"File saved to {fs_path}")
-                            else:
-                                print("DH0: access not available on this system")
-                        except Exception as e:
-                            print(f"Error saving file: {e}")
-                    else:
-                        # Save to virtual file system
-                        self.files[file_path] = content_str
-                        print("File saved to virtual filesystem.")
+                    self._ed_save(file_path, lines)
                 elif cmd == "QUIT":
                     print("Editor exited without saving.")
                     return
@@ -2015,43 +2167,7 @@ Examples:
                 try:
                     save_choice = input("Save changes before exiting? (y/N): ").strip().lower()
                     if save_choice in ['y', 'yes']:
-                        # Save content
-                        content_str = '\n'.join(lines)
-                        
-                        if file_path.startswith("DH0:"):
-                            # Save to actual file system
-                            try:
-                                # Check if we're running in WSL environment
-                                is_wsl = os.path.exists("/mnt/c")
-                                is_windows = platform.system() == "Windows"
-                                
-                                if is_wsl or is_windows:
-                                    sub_path = file_path[4:]  # Remove "DH0:" prefix
-                                    if sub_path.startswith("/"):
-                                        sub_path = sub_path[1:]
-                                    
-                                    if is_wsl:
-                                        fs_path = os.path.join("/mnt/c", sub_path.replace("\\", "/"))
-                                    else:
-                                        fs_path = os.path.join("C:\\", sub_path.replace("/", "\\"))
-                                    
-                                    # Normalize the path
-                                    fs_path = os.path.normpath(fs_path)
-                                    
-                                    # Create directory if needed
-                                    fs_dir = os.path.dirname(fs_path)
-                                    if fs_dir and not os.path.exists(fs_dir):
-                                        os.makedirs(fs_dir)
-                                    
-                                    with open(fs_path, 'w', encoding='utf-8') as f:
-                                        f.write(content_str)
-                                    print(f"File saved to {fs_path}")
-                            except Exception as e:
-                                print(f"Error saving file: {e}")
-                        else:
-                            # Save to virtual file system
-                            self.files[file_path] = content_str
-                            print("File saved.")
+                        self._ed_save(file_path, lines)
                     print("Editor exited.")
                 except KeyboardInterrupt:
                     print("\nEditor exited without saving.")
@@ -2060,6 +2176,48 @@ Examples:
                 print("\nEditor exited.")
                 return
                 
+    @staticmethod
+    def _ed_read_piped_line(prompt):
+        """Read one line from non-interactive stdin, behaving like input()"""
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+        line = sys.stdin.readline()
+        if not line:
+            raise EOFError
+        return line[:-1] if line.endswith("\n") else line
+        
+    def _ed_save(self, file_path, lines):
+        """Save the editor's lines to a real DH0: file or the virtual filesystem"""
+        # Check if this is a real file (DH0:) or virtual file
+        if file_path.startswith("DH0:"):
+            if not DH0_IS_REAL:
+                print("DH0: access not available on this system")
+                return
+            
+            # Save to actual file system
+            try:
+                fs_path = dh0_to_fs_path(file_path)
+                
+                # Create directory if needed
+                fs_dir = os.path.dirname(fs_path)
+                if fs_dir:
+                    os.makedirs(fs_dir, exist_ok=True)
+                
+                # Write line by line rather than joining the whole buffer first
+                with open(fs_path, 'w', encoding='utf-8') as f:
+                    line_iter = iter(lines)
+                    f.write(next(line_iter, ""))
+                    for line in line_iter:
+                        f.write("\n")
+                        f.write(line)
+                print(f"File saved to {fs_path}")
+            except Exception as e:
+                print(f"Error saving file: {e}")
+        else:
+            # Save to virtual file system
+            self._store_file(file_path, '\n'.join(lines))
+            print("File saved to virtual filesystem.")
+            
     def do_cls(self, arg):
         """CLS - Clear screen"""
         os.system('cls' if os.name == 'nt' else 'clear')
@@ -2086,7 +2244,7 @@ Examples:
     def default(self, line):
         """Handle unknown commands"""
         # Check if it's a device name (ends with :)
-        if line and line.upper().endswith(':'):
+        if line.endswith(':'):
             device = line.upper()
             if device in self.directories:
                 result = self._change_directory(line)
@@ -2112,7 +2270,7 @@ Examples:
             return
             
         # Try to find the script in actual file system (for DH0:)
-        if script_path.startswith("DH0:") and platform.system() == "Windows":
+        if script_path.startswith("DH0:") and IS_WINDOWS:
             try:
                 fs_path = self._get_fs_path(script_path)
                 if fs_path and os.path.exists(fs_path):
@@ -2127,42 +2285,7 @@ Examples:
 
     def _resolve_path(self, path):
         """Resolve a relative or absolute path against current directory"""
-        if not path:
-            return self.current_dir
-            
-        # Handle absolute paths (with device:)
-        if ":" in path:
-            # Handle logical assignments (common Amiga directory shortcuts)
-            logical_assignments = {
-                "S:": "SYS:S",
-                "L:": "SYS:L", 
-                "DEVS:": "SYS:DEVS",
-                "FONTS:": "SYS:Fonts",
-                "T:": "RAM:T"
-            }
-            
-            # Check if this is a logical assignment
-            path_upper = path.upper()
-            for logical, actual in logical_assignments.items():
-                if path_upper.startswith(logical):
-                    # Replace the logical assignment with the actual path
-                    remaining_path = path[len(logical):]
-                    if remaining_path:
-                        return f"{actual}/{remaining_path}"
-                    else:
-                        return actual
-            
-            return path
-            
-        # Handle relative paths
-        if self.current_dir.upper() == "DH0:":
-            return f"DH0:/{path}"
-        elif self.current_dir.upper().startswith("DH0:"):
-            return f"{self.current_dir}/{path}"
-        elif self.current_dir.endswith(":"):
-            return f"{self.current_dir}{path}"
-        else:
-            return f"{self.current_dir}/{path}"
+        return resolve_path(self.current_dir, path)
 
     def _list_files(self, path=None):
         """List files in directory with Amiga DIR command format"""
@@ -2173,51 +2296,28 @@ Examples:
             path = self._resolve_path(path)
         
         # Check if this is a mounted emulator shared folder
-        device = path.split('/')[0] if '/' in path else path
-        device = device.upper()
-        if not device.endswith(':'):
-            device += ':'
+        device = normalize_device(path.split('/')[0] if '/' in path else path)
         
         if device in self.emulator_integration.mounted_shared_folders:
             return self._list_shared_folder_files(path, device)
             
         # Handle DH0: (Windows C: drive) with actual file system access
         if path.upper().startswith("DH0:"):
-            # Check if we're running in WSL environment
-            is_wsl = os.path.exists("/mnt/c")
-            is_windows = platform.system() == "Windows"
-            
-            if is_wsl or is_windows:
+            if DH0_IS_REAL:
                 try:
                     # Determine the actual file system path
-                    if path.upper() == "DH0:":
-                        if is_wsl:
-                            fs_path = "/mnt/c"
-                        else:
-                            fs_path = "C:\\"
-                    else:
-                        # Extract subdirectory path from DH0:subdir format
-                        sub_path = path[4:]  # Remove "DH0:" prefix
-                        if sub_path.startswith("/"):
-                            sub_path = sub_path[1:]
-                        
-                        if is_wsl:
-                            fs_path = os.path.join("/mnt/c", sub_path.replace("\\", "/"))
-                        else:
-                            fs_path = os.path.join("C:\\", sub_path.replace("/", "\\"))
-                    
-                    # Normalize the path
-                    fs_path = os.path.normpath(fs_path)
+                    fs_path = dh0_to_fs_path(path)
                     
-                    if os.path.exists(fs_path) and os.path.isdir(fs_path):
+                    if os.path.isdir(fs_path):
                         # Authentic Amiga DIR header with day and date
-                        day_name = self._format_amiga_day(file_path=fs_path)
-                        header_date = self._format_amiga_date(file_path=fs_path)
+                        header_time = self._real_mtime(fs_path)
+                        day_name = self._format_amiga_day(timestamp=header_time)
+                        header_date = self._format_amiga_date(timestamp=header_time)
                         print(f'Directory "{path}" on {day_name} {header_date}')
                         
                         # List actual directories and files in the path
                         try:
-                            items = os.listdir(fs_path)
+                            dirs, files = self._scan_real_dir(fs_path)
                         except PermissionError:
                             print("Access denied to this directory.")
                             return
@@ -2225,46 +2325,22 @@ Examples:
                             print(f"Error reading directory: {e}")
                             return
                         
-                        dirs = []
-                        files = []
-                        
-                        # Separate directories and files
-                        for item in items:
-                            item_path = os.path.join(fs_path, item)
-                            try:
-                                if os.path.isdir(item_path):
-                                    dirs.append(item)
-                                else:
-                                    files.append(item)
-                            except:
-                                # If we can't access the item, treat it as a file
-                                files.append(item)
-                                
-                        # Sort directories and files
-                        dirs.sort(key=str.lower)
-                        files.sort(key=str.lower)
-                        
                         # Print directories first (authentic Amiga format)
-                        for dir_name in dirs:
-                            dir_path = os.path.join(fs_path, dir_name)
-                            date_str = self._format_amiga_date(file_path=dir_path, full_format=True)
-                            print(f" {dir_name:<22} (dir)    ----rwed     {date_str}")
+                        for entry in dirs:
+                            date_str = self._format_amiga_date(timestamp=self._real_mtime(entry), full_format=True)
+                            print(f" {entry.name:<22} (dir)    ----rwed     {date_str}")
                             
                         # Print files (authentic Amiga format)
-                        for file_name in files:
-                            file_path = os.path.join(fs_path, file_name)
-                            try:
-                                file_size = os.path.getsize(file_path)
-                            except:
-                                file_size = 0
-                            date_str = self._format_amiga_date(file_path=file_path, full_format=True)
+                        total_bytes = 0
+                        for entry in files:
+                            file_name = entry.name
+                            file_size, mtime = self._real_size_mtime(entry)
+                            total_bytes += file_size
+                            date_str = self._format_amiga_date(timestamp=mtime, full_format=True)
                             print(f" {file_name:<22} {file_size:>7}  ----rwed     {date_str}")
                             
                         dir_count = len(dirs)
                         file_count = len(files)
-                        total_bytes = sum(os.path.getsize(os.path.join(fs_path, f)) 
-                                        for f in files 
-                                        if os.path.isfile(os.path.join(fs_path, f)))
                         print(f"{dir_count + file_count} files - {dir_count} directories - {total_bytes} bytes used")
                         return
                     else:
@@ -2448,10 +2524,7 @@ Examples:
     def _change_directory(self, path):
         """Change directory"""
         # Check if this is a mounted emulator shared folder
-        device = path.split('/')[0] if '/' in path else path
-        device = device.upper()
-        if not device.endswith(':'):
-            device += ':'
+        device = normalize_device(path.split('/')[0] if '/' in path else path)
         
         if device in self.emulator_integration.mounted_shared_folders:
             return self._change_shared_folder_directory(path, device)
@@ -2521,25 +2594,11 @@ Examples:
         if ":" in path:
             # Special handling for DH0: subdirectories
             if path.upper().startswith("DH0:"):
-                # Check if we're running in WSL environment
-                is_wsl = os.path.exists("/mnt/c")
-                is_windows = platform.system() == "Windows"
-                
-                if is_wsl or is_windows:
+                if DH0_IS_REAL:
                     try:
-                        sub_path = path[4:]  # Remove "DH0:" prefix
-                        if sub_path.startswith("/"):
-                            sub_path = sub_path[1:]
-                        
-                        if is_wsl:
-                            fs_path = os.path.join("/mnt/c", sub_path.replace("\\", "/"))
-                        else:
-                            fs_path = os.path.join("C:\\", sub_path.replace("/", "\\"))
+                        fs_path = dh0_to_fs_path(path)
                         
-                        # Normalize the path
-                        fs_path = os.path.normpath(fs_path)
-                        
-                        if os.path.exists(fs_path) and os.path.isdir(fs_path):
+                        if os.path.isdir(fs_path):
                             self.current_dir = path
                             self.prompt = f"{self.current_dir}> "
                             return ""
@@ -2557,11 +2616,7 @@ Examples:
         # Handle relative paths
         # Special handling for DH0: subdirectories
         if self.current_dir.upper().startswith("DH0:"):
-            # Check if we're running in WSL environment
-            is_wsl = os.path.exists("/mnt/c")
-            is_windows = platform.system() == "Windows"
-            
-            if is_wsl or is_windows:
+            if DH0_IS_REAL:
                 try:
                     # Construct the new path
                     if self.current_dir.upper() == "DH0:":
@@ -2570,19 +2625,9 @@ Examples:
                         new_path = f"{self.current_dir}/{path}"
                     
                     # Check if the path exists in the actual file system
-                    sub_path = new_path[4:]  # Remove "DH0:" prefix
-                    if sub_path.startswith("/"):
-                        sub_path = sub_path[1:]
-                    
-                    if is_wsl:
-                        fs_path = os.path.join("/mnt/c", sub_path.replace("\\", "/"))
-                    else:
-                        fs_path = os.path.join("C:\\", sub_path.replace("/", "\\"))
-                    
-                    # Normalize the path
-                    fs_path = os.path.normpath(fs_path)
+                    fs_path = dh0_to_fs_path(new_path)
                     
-                    if os.path.exists(fs_path) and os.path.isdir(fs_path):
+                    if os.path.isdir(fs_path):
                         self.current_dir = new_path
                         self.prompt = f"{self.current_dir}> "
                         return ""
@@ -2659,7 +2704,7 @@ Python Version: {platform.python_version()}"""
             
             # Disk information
             disk_usage = psutil.disk_usage('/')
-            if platform.system() == "Windows":
+            if IS_WINDOWS:
                 try:
                     disk_usage = psutil.disk_usage('C:')
                 except:
@@ -2689,9 +2734,8 @@ Python Version: {platform.python_version()}"""
         
         # Environment information
         env_info = ""
-        if platform.system() == "Windows":
-            is_wsl = os.path.exists("/mnt/c")
-            if is_wsl:
+        if IS_WINDOWS:
+            if IS_WSL:
                 env_info = "Environment: WSL (Windows Subsystem for Linux)"
             else:
                 env_info = "Environment: Native Windows"
@@ -2828,7 +2872,7 @@ Last Command: {getattr(self, 'lastcmd', 'None')}"""
             if device.upper() == "DH0:":
                 # Check if Windows C: drive is accessible
                 try:
-                    if platform.system() == "Windows":
+                    if IS_WINDOWS:
                         disk_usage = psutil.disk_usage('C:') if 'psutil' in globals() else None
                         if disk_usage:
                             free_gb = disk_usage.free // (1024**3)
@@ -2868,7 +2912,7 @@ Type 'dir' to list current directory contents"""
             
             # Verify the directory exists
             fs_path = os.path.normpath(fs_path)
-            if not os.path.exists(fs_path) or not os.path.isdir(fs_path):
+            if not os.path.isdir(fs_path):
                 return f"Directory {path} not found."
             
             self.current_dir = path
@@ -2878,7 +2922,8 @@ Type 'dir' to list current directory contents"""
 
     def _list_winuae_configs(self):
         """List available WinUAE configurations with their shared folders"""
-        if not self.emulator_integration.winuae_configs:
+        configs = self.emulator_integration.winuae_configs
+        if not configs:
             print("No WinUAE configurations found.")
             print("Make sure WinUAE is installed and configurations exist in:")
             print(f"  {WINUAE_CONFIG['config_dir']}")
@@ -2886,7 +2931,7 @@ Type 'dir' to list current directory contents"""
         
         print("Available WinUAE Configurations:")
         print("=" * 40)
-        for config_name, config_info in self.emulator_integration.winuae_configs.items():
+        for config_name, config_info in configs.items():
             print(f"\n  Config: {config_name}")
             print(f"  Path:   {config_info['path']}")
             if config_info['shared_folders']:
@@ -2899,7 +2944,8 @@ Type 'dir' to list current directory contents"""
     
     def _list_fsuae_configs(self):
         """List available FS-UAE configurations with their shared folders"""
-        if not self.emulator_integration.fsuae_configs:
+        configs = self.emulator_integration.fsuae_configs
+        if not configs:
             print("No FS-UAE configurations found.")
             print("Make sure FS-UAE is installed and configurations exist in:")
             print("  ~/.config/fs-uae/")
@@ -2908,7 +2954,7 @@ Type 'dir' to list current directory contents"""
         
         print("Available FS-UAE Configurations:")
         print("=" * 40)
-        for config_name, config_info in self.emulator_integration.fsuae_configs.items():
+        for config_name, config_info in configs.items():
             print(f"\n  Config: {config_name}")
             print(f"  Path:   {config_info['path']}")
             if config_info['shared_folders']:
@@ -2945,9 +2991,7 @@ Type 'dir' to list current directory contents"""
                 shared_devices = ", ".join(config['shared_folders']) if config['shared_folders'] else "None"
                 print(f"  {config['name']} (Devices: {shared_devices})")
         
-        print("\nUsage:")
-        print("  MOUNT <device> FROM WINUAE \"<config_name>\"")
-        print("  MOUNT <device> FROM FS-UAE \"<config_name>\"")
+        print(MOUNT_FROM_USAGE)
 
     def _mount_command(self):
         """Mounted volumes"""
@@ -3166,19 +3210,22 @@ Amiga Features:
         found = False
         
         # Handle DH0: with actual file system access
-        if self.current_dir.upper() == "DH0:" and platform.system() == "Windows":
+        if self.current_dir.upper() == "DH0:" and IS_WINDOWS:
             try:
                 c_drive_path = "C:\\"
                 if os.path.exists(c_drive_path):
-                    items = os.listdir(c_drive_path)
-                    for item in items:
-                        if pattern == "*" or item.startswith(pattern) or (pattern.startswith("~") and item.startswith(pattern[1:])):
-                            item_path = os.path.join(c_drive_path, item)
-                            if os.path.isdir(item_path):
-                                output += f"  {item}/ (drwx)\n"
-                            else:
-                                output += f"  {item} (rwed)\n"
-                            found = True
+                    match_all = pattern == "*"
+                    prefix = pattern[1:] if pattern.startswith("~") else None
+                    with os.scandir(c_drive_path) as it:
+                        for entry in it:
+                            item = entry.name
+                            # Test the name before looking at the entry type
+                            if match_all or item.startswith(pattern) or (prefix is not None and item.startswith(prefix)):
+                                if entry.is_dir():
+                                    output += f"  {item}/ (drwx)\n"
+                                else:
+                                    output += f"  {item} (rwed)\n"
+                                found = True
                     if found:
                         return output
             except Exception: